@@ -0,0 +1,249 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import math
+
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+# Easing curves map normalized time in [0, 1] to normalized progress.
+
+def linear(t: float) -> float:
+    return t
+
+
+def ease_in_quad(t: float) -> float:
+    return t * t
+
+
+def ease_out_quad(t: float) -> float:
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t: float) -> float:
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_in_cubic(t: float) -> float:
+    return t ** 3
+
+
+def ease_out_cubic(t: float) -> float:
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_cubic(t: float) -> float:
+    return 4 * t ** 3 if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+def ease_in_out_sine(t: float) -> float:
+    return -(math.cos(math.pi * t) - 1) / 2
+
+
+def ease_out_back(t: float) -> float:
+    c = 1.70158
+    return 1 + (c + 1) * (t - 1) ** 3 + c * (t - 1) ** 2
+
+
+# @class PGTween
+# @abstract Interpolates one property of one object over wall-clock time.
+# @discussion The start value is read when the tween begins, not when it is created,
+#             so tweens queued on the same property run one after another from
+#             wherever the previous one ended. Either @duration (seconds) or @speed
+#             (units per second) must be given; with only a speed the duration is
+#             derived from the distance at the time the tween begins. Values may be
+#             numbers or tuples of numbers; @convert is applied to every value set.
+
+class PGTween:
+    def __init__(self, target: Any, prop: str, end: Any, duration: float = None, speed: float = None,
+                 easing: Callable[[float], float] = linear, convert: Callable = None,
+                 on_finish: Callable = None) -> None:
+        assert duration is not None or speed, "Either duration or speed must be given!"
+        self.target = target
+        self.prop = prop
+        self._end = end
+        self._duration = duration
+        self._speed = speed
+        self._easing = easing
+        self._convert = convert
+        self._onFinish = on_finish
+        self._start = None
+        self._elapsed = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._start is not None
+
+    def begin(self) -> None:
+        self._start = getattr(self.target, self.prop)
+        if self._duration is None:
+            self._duration = self._distance(self._start, self._end) / self._speed
+
+    # @function step
+    # @abstract Advances the tween by @dt seconds and applies the new value.
+    # @discussion With @apply unset only the time advances; the end value is still
+    #             applied when the tween finishes.
+    # @return The unused part of @dt once the tween has finished, otherwise None.
+
+    def step(self, dt: float, apply: bool = True) -> Optional[float]:
+        if not self.started:
+            self.begin()
+        self._elapsed += dt
+        if self._elapsed >= self._duration:
+            self._set(self._end)
+            if self._onFinish:
+                self._onFinish()
+            return self._elapsed - self._duration
+        if apply:
+            self._set(self._lerp(self._start, self._end, self._easing(self._elapsed / self._duration)))
+        return None
+
+    # @function preview
+    # @abstract Applies the value the tween will have @ahead seconds from now.
+    # @discussion The elapsed time is left as it is, so the next step() continues
+    #             from where the tween really is.
+
+    def preview(self, ahead: float) -> None:
+        if self.started:
+            self._set(self._lerp(self._start, self._end,
+                                 self._easing(min(self._elapsed + ahead, self._duration) / self._duration)))
+
+    def _set(self, value: Any) -> None:
+        if self._convert:
+            value = self._convert(value)
+        setattr(self.target, self.prop, value)
+
+    @staticmethod
+    def _lerp(a: Any, b: Any, t: float) -> Any:
+        if isinstance(a, (tuple, list)):
+            return tuple(x + (y - x) * t for x, y in zip(a, b))
+        return a + (b - a) * t
+
+    @staticmethod
+    def _distance(a: Any, b: Any) -> float:
+        if isinstance(a, (tuple, list)):
+            return math.dist(a, b)
+        return abs(b - a)
+
+
+# @class PGAnimator
+# @abstract Central scheduler for all running tweens.
+# @discussion Tweens are grouped per target and per property. Properties of the same
+#             target animate concurrently while tweens on one property run in the
+#             order they were added. Only targets with queued tweens are stored, so
+#             the cost of update() grows with the number of running animations and
+#             not with the number of objects in the game. Time is advanced by the
+#             game loop in fixed timesteps, and blend() shows the tweens between two
+#             steps when a frame is drawn in between. Targets
+#             that define _set_animating(bool) are told when their first tween is
+#             added and when their last one finishes or is cancelled.
+#             With @skip_culled set, targets whose culled attribute is true, that is
+#             objects outside the screen, only advance in time and jump to the end
+#             values. Position tweens are always applied since they decide whether
+#             the target comes back on screen.
+
+class PGAnimator:
+    def __init__(self, skip_culled: bool = False) -> None:
+        self._tracks = {}
+        self._time = 0.0
+        self._skipCulled = skip_culled
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def skip_culled(self) -> bool:
+        return self._skipCulled
+
+    @skip_culled.setter
+    def skip_culled(self, skip: bool) -> None:
+        self._skipCulled = skip
+
+    @property
+    def active(self) -> int:
+        return sum(len(props) for props in self._tracks.values())
+
+    def add(self, tween: PGTween) -> PGTween:
+        if tween.target not in self._tracks:
+            self._tracks[tween.target] = {}
+            self._notify(tween.target, True)
+        self._tracks[tween.target].setdefault(tween.prop, deque()).append(tween)
+        return tween
+
+    def cancel(self, target: Any, prop: str = None) -> None:
+        if prop is None:
+            if self._tracks.pop(target, None) is not None:
+                self._notify(target, False)
+            return
+        props = self._tracks.get(target)
+        if props:
+            props.pop(prop, None)
+            if not props:
+                del self._tracks[target]
+                self._notify(target, False)
+
+    def is_animating(self, target: Any, prop: str = None) -> bool:
+        props = self._tracks.get(target)
+        if not props:
+            return False
+        return prop is None or prop in props
+
+    def update(self, dt: float) -> None:
+        self._time += dt
+        for target, props in list(self._tracks.items()):
+            culled = self._skipCulled and getattr(target, "culled", False)
+            for prop, queue in list(props.items()):
+                apply = not culled or prop == "pos"
+                remaining = dt
+                while queue:
+                    remaining = queue[0].step(remaining, apply)
+                    if remaining is None:
+                        break
+                    queue.popleft()
+                if not queue and props.get(prop) is queue:
+                    del props[prop]
+            if not props and self._tracks.get(target) is props:
+                del self._tracks[target]
+                self._notify(target, False)
+
+    # @function blend
+    # @abstract Shows every running tween as it will be @ahead seconds after the last update.
+
+    def blend(self, ahead: float) -> None:
+        for target, props in self._tracks.items():
+            culled = self._skipCulled and getattr(target, "culled", False)
+            for prop, queue in props.items():
+                if not culled or prop == "pos":
+                    queue[0].preview(ahead)
+
+    @staticmethod
+    def _notify(target: Any, active: bool) -> None:
+        hook = getattr(target, "_set_animating", None)
+        if hook:
+            hook(active)
+
+
+animator = PGAnimator()
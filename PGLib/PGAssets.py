@@ -0,0 +1,145 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from typing import Callable
+from PGLib.PGGlobal import *
+from PGLib.PGSurfaceCache import PGSurfaceCache
+from PGLib.PGAtlas import PGAtlas
+from PGLib.PGBundle import PGBundle
+
+
+# @class PGAssetManager
+# @abstract Bounded LRU cache of images loaded from disk.
+# @discussion Images are keyed by their path, a variant name and the size they are
+#             scaled to. Every image is converted once: to the display format with
+#             per-pixel alpha, or without alpha for opaque images such as backgrounds,
+#             which blit faster. A variant is derived from the plain image of the same
+#             size by the @build function given when it is first requested, which
+#             receives a copy and may change it in place or return a new surface.
+#             Cached surfaces are shared and must be treated as read-only. Entries are
+#             evicted least recently used first once @budget bytes are exceeded;
+#             surfaces still in use simply stay alive with their users.
+#             Images found in a registered bundle at the requested size are created
+#             from its mapped pixels, and images packed into a registered atlas are
+#             served as subsurfaces of it. All others are read through @loader,
+#             which PGGame points at its preloader so that preloaded images are
+#             picked up from there. @loader receives the alpha flag, so that it
+#             converts the image to its final format in one go.
+
+class PGAssetManager(PGSurfaceCache):
+    def __init__(self, budget: int = 64 * 1024 * 1024) -> None:
+        super().__init__(budget)
+        self._atlases = []
+        self._bundles = []
+        self._sounds = {}
+        self.loader = self.load
+
+    # @function image
+    # @abstract Returns the image at @path, scaled to @size if given.
+    # @param variant Name of a derived version of the image, built by @build.
+    # @param alpha Whether the image keeps per-pixel alpha.
+
+    def image(self, path: str, size: tuple[int, int] = None, variant: str = None,
+              build: Callable[[pygame.Surface], pygame.Surface] = None, alpha: bool = True) -> pygame.Surface:
+        size = tuple(size) if size else None
+        key = (path, variant, size, alpha)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface
+
+        if variant is not None:
+            assert build, "Variant must have a build function!"
+            surface = self.image(path, size, alpha=alpha).copy()
+            surface = build(surface) or surface
+        else:
+            surface = self._load(path, size, alpha)
+        return self._store(key, surface)
+
+    def _load(self, path: str, size: tuple[int, int], alpha: bool) -> pygame.Surface:
+        for bundle in self._bundles:
+            surface = bundle.image(path, size, alpha)
+            if surface is not None:
+                return surface
+        for atlas in self._atlases:
+            name = atlas.lookup(path)
+            if name:
+                region = atlas.region(name)
+                if size and region.get_size() != size:
+                    region = pygame.transform.smoothscale(region, size)
+                return region if alpha else region.convert()
+        return self.loader(path, size, alpha)
+
+    # @function cached
+    # @abstract Whether the plain image at @path and @size is in the cache.
+
+    def cached(self, path: str, size: tuple[int, int] = None) -> bool:
+        size = tuple(size) if size else None
+        return (path, None, size, True) in self._entries or (path, None, size, False) in self._entries
+
+    # @function add_atlas
+    # @abstract Serves the images packed into @atlas from it from now on.
+
+    def add_atlas(self, atlas: PGAtlas) -> None:
+        self._atlases.append(atlas)
+
+    # @function add_bundle
+    # @abstract Serves the images and sounds held by @bundle from it from now on.
+
+    def add_bundle(self, bundle: PGBundle) -> None:
+        self._bundles.append(bundle)
+
+    # @function prebuilt
+    # @abstract Whether the image at @path and @size comes from a bundle or atlas.
+    # @discussion Such images need no decoding and are not worth preloading.
+
+    def prebuilt(self, path: str, size: tuple[int, int] = None) -> bool:
+        return (any(bundle.contains(path, size) for bundle in self._bundles)
+                or any(atlas.lookup(path) for atlas in self._atlases))
+
+    # @function sound
+    # @abstract Returns the shared sound at @path, loaded once.
+    # @discussion Sounds are few and small next to images, so they are kept for good.
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        sound = self._sounds.get(path)
+        if sound is None:
+            for bundle in self._bundles:
+                sound = bundle.sound(path)
+                if sound is not None:
+                    break
+            else:
+                sound = pygame.mixer.Sound(path)
+            self._sounds[path] = sound
+        return sound
+
+    @staticmethod
+    def load(path: str, size: tuple[int, int] = None, alpha: bool = True) -> pygame.Surface:
+        surface = pygame.image.load(path)
+        if size and surface.get_size() != size:
+            surface = pygame.transform.smoothscale(surface.convert_alpha(), size)
+            return surface if alpha else surface.convert()
+        return surface.convert_alpha() if alpha else surface.convert()
+
+
+asset_manager = PGAssetManager()
@@ -0,0 +1,144 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import os
+
+from PGLib.PGGlobal import *
+
+
+# Texture atlases
+# pack_atlas() is a build step that copies every image of a directory into one
+# atlas image and writes an index of the region each one occupies. At runtime a
+# PGAtlas decodes that single image and hands out subsurfaces of it by name, so all
+# images share one surface and one decode. Images larger than @max_size on either
+# side are scaled down when packed, since the game never shows them that large.
+
+ATLAS_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga")
+
+
+# @function pack_atlas
+# @abstract Packs the images in @directory into @output.png and its index @output.json.
+# @discussion Images are placed in rows, tallest first, in the narrowest power of two
+#             width that keeps the atlas roughly square. Regions are separated by
+#             @padding transparent pixels. Runs without a display.
+# @return The path of the index.
+
+def pack_atlas(directory: str, output: str, max_size: int = 512, padding: int = 1) -> str:
+    images = {}
+    for file in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file)
+        if extension.lower() not in ATLAS_EXTENSIONS:
+            continue
+        image = pygame.image.load(os.path.join(directory, file))
+        image = pygame.image.frombuffer(pygame.image.tobytes(image, "RGBA"), image.get_size(), "RGBA")
+        factor = min(1, max_size / max(image.get_size()))
+        if factor < 1:
+            image = pygame.transform.smoothscale(image, (max(1, round(image.get_width() * factor)),
+                                                         max(1, round(image.get_height() * factor))))
+        images[name] = (file, image)
+
+    order = sorted(images, key=lambda n: (-images[n][1].get_height(), n))
+    area = sum((image.get_width() + padding) * (image.get_height() + padding) for _, image in images.values())
+    width = 1
+    while width * width < area or width < max(image.get_width() + padding for _, image in images.values()):
+        width *= 2
+
+    regions = {}
+    x = y = row_height = 0
+    for name in order:
+        w, h = images[name][1].get_size()
+        if x + w > width:
+            x, y = 0, y + row_height + padding
+            row_height = 0
+        regions[name] = (x, y, w, h)
+        x += w + padding
+        row_height = max(row_height, h)
+
+    atlas = pygame.Surface((width, y + row_height), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for name, (x, y, w, h) in regions.items():
+        atlas.blit(images[name][1], (x, y))
+
+    image_path = output + ".png"
+    index_path = output + ".json"
+    pygame.image.save(atlas, image_path)
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    index = {"image": os.path.basename(image_path),
+             "regions": {name: {"rect": regions[name],
+                                "source": os.path.relpath(os.path.join(directory, images[name][0]), index_dir)}
+                         for name in order}}
+    with open(index_path, "w") as file:
+        json.dump(index, file, indent=1)
+    return index_path
+
+
+# @class PGAtlas
+# @abstract An atlas written by pack_atlas, loaded with a single decode.
+
+class PGAtlas:
+    def __init__(self, index_path: str) -> None:
+        with open(index_path) as file:
+            index = json.load(file)
+        directory = os.path.dirname(os.path.abspath(index_path))
+        self._image = pygame.image.load(os.path.join(directory, index["image"])).convert_alpha()
+        self._regions = {name: pygame.Rect(region["rect"]) for name, region in index["regions"].items()}
+        self._sources = {os.path.normpath(os.path.join(directory, region["source"])): name
+                         for name, region in index["regions"].items()}
+        self._views = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._regions
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    @property
+    def image(self) -> pygame.Surface:
+        return self._image
+
+    def names(self) -> list[str]:
+        return list(self._regions)
+
+    # @function region
+    # @abstract The image @name as a subsurface of the atlas; shared and read-only.
+
+    def region(self, name: str) -> pygame.Surface:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = self._image.subsurface(self._regions[name])
+        return view
+
+    # @function lookup
+    # @abstract The name of the region packed from the image file at @path, if any.
+
+    def lookup(self, path: str) -> str:
+        return self._sources.get(os.path.abspath(path))
+
+
+if __name__ == "__main__":
+    import sys
+
+    assert len(sys.argv) in (3, 4), "Usage: python -m PGLib.PGAtlas directory output [max_size]"
+    print(pack_atlas(sys.argv[1], sys.argv[2], *map(int, sys.argv[3:])))
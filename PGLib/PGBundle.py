@@ -0,0 +1,148 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import mmap
+import os
+import struct
+
+from PGLib.PGGlobal import *
+
+
+# Asset bundles
+# build_bundle() is a build step that decodes images and sounds once and writes
+# their raw data into a single file: images as RGBA pixels at the size the game
+# shows them, sounds as PCM samples in the mixer format. A JSON index at the start
+# of the file locates every entry. At runtime PGBundle memory-maps the file and
+# creates surfaces and sounds straight from the mapped bytes, so nothing is decoded
+# and only the pages actually used are read from disk. Entries are keyed by their
+# path relative to the bundle file, so a bundle can be moved along with the assets.
+#
+# Layout: MAGIC, then the version and the index length as little-endian uint32,
+# then the index, then the data, each entry aligned to ALIGNMENT bytes.
+
+BUNDLE_MAGIC = b"PGBUNDLE"
+BUNDLE_VERSION = 1
+BUNDLE_ALIGNMENT = 16
+
+
+def _image_key(path: str, size: tuple[int, int] = None) -> str:
+    key = os.path.abspath(path)
+    return f"{key}@{size[0]}x{size[1]}" if size else key
+
+
+# @function build_bundle
+# @abstract Writes the @images, as (path, size) pairs, and @sounds to the bundle @output.
+# @discussion Sounds are stored in the format of the initialized mixer and can only
+#             be used by games whose mixer runs in the same format.
+
+def build_bundle(output: str, images: list[tuple[str, tuple[int, int]]], sounds: list[str] = ()) -> None:
+    entries = {}
+    blobs = []
+    offset = 0
+    directory = os.path.dirname(os.path.abspath(output))
+
+    def add(key: str, data: bytes, **info) -> None:
+        nonlocal offset
+        offset += -offset % BUNDLE_ALIGNMENT
+        entries[os.path.relpath(key, directory)] = dict(info, offset=offset, length=len(data))
+        blobs.append((offset, data))
+        offset += len(data)
+
+    for path, size in images:
+        surface = pygame.image.load(path)
+        surface = pygame.image.frombuffer(pygame.image.tobytes(surface, "RGBA"), surface.get_size(), "RGBA")
+        if size and surface.get_size() != tuple(size):
+            surface = pygame.transform.smoothscale(surface, size)
+        add(_image_key(path, size), pygame.image.tobytes(surface, "RGBA"), kind="image", size=surface.get_size())
+    mixer = pygame.mixer.get_init()
+    for path in sounds:
+        assert mixer, "Mixer must be initialized!"
+        add(os.path.abspath(path), pygame.mixer.Sound(path).get_raw(), kind="sound")
+
+    index = json.dumps({"mixer": mixer, "entries": entries}).encode()
+    start = len(BUNDLE_MAGIC) + 8 + len(index)
+    start += -start % BUNDLE_ALIGNMENT
+    with open(output, "wb") as file:
+        file.write(BUNDLE_MAGIC + struct.pack("<II", BUNDLE_VERSION, len(index)) + index)
+        file.write(bytes(start - file.tell()))
+        for position, data in blobs:
+            file.write(bytes(start + position - file.tell()))
+            file.write(data)
+
+
+# @class PGBundle
+# @abstract A memory-mapped bundle written by build_bundle.
+# @discussion The file stays mapped for as long as the bundle exists. Lookups of
+#             entries the bundle does not hold return None, so callers can fall back
+#             to decoding the original file.
+
+class PGBundle:
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert self._map[:len(BUNDLE_MAGIC)] == BUNDLE_MAGIC, "File must be an asset bundle!"
+        version, length = struct.unpack_from("<II", self._map, len(BUNDLE_MAGIC))
+        assert version == BUNDLE_VERSION, "Unsupported bundle version!"
+        start = len(BUNDLE_MAGIC) + 8
+        index = json.loads(self._map[start:start + length])
+        self._start = start + length + -(start + length) % BUNDLE_ALIGNMENT
+        directory = os.path.dirname(os.path.abspath(path))
+        self._entries = {os.path.normpath(os.path.join(directory, key)): entry
+                         for key, entry in index["entries"].items()}
+        self._mixer = tuple(index["mixer"]) if index["mixer"] else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _data(self, entry: dict) -> memoryview:
+        offset = self._start + entry["offset"]
+        return memoryview(self._map)[offset:offset + entry["length"]]
+
+    def contains(self, path: str, size: tuple[int, int] = None) -> bool:
+        return _image_key(path, size) in self._entries
+
+    # @function image
+    # @abstract The image at @path, scaled to @size, or None if the bundle lacks it.
+    # @discussion Converted to the display format, with per-pixel alpha if @alpha is
+    #             set, when there is a display; without one the surface uses the
+    #             mapped pixels directly.
+
+    def image(self, path: str, size: tuple[int, int] = None, alpha: bool = True) -> pygame.Surface:
+        entry = self._entries.get(_image_key(path, size))
+        if not entry:
+            return None
+        surface = pygame.image.frombuffer(self._data(entry), entry["size"], "RGBA")
+        if not pygame.display.get_surface():
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    # @function sound
+    # @abstract The sound at @path, or None if the bundle lacks it or the mixer format differs.
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        entry = self._entries.get(os.path.abspath(path))
+        if not entry or pygame.mixer.get_init() != self._mixer:
+            return None
+        return pygame.mixer.Sound(buffer=self._data(entry))
@@ -25,6 +25,7 @@
 import pygame.font
 from webcolors import name_to_rgb
 from PGLib.PGObject import *
+from PGLib.PGFonts import font_registry
 from typing import Type
 
 
@@ -54,7 +55,7 @@ class PGTextButton(PGObject):
         if font:
             self._font = font
         else:
-            self._font = pygame.font.SysFont("Ariel", 20)
+            self._font = font_registry.font("Arial", 20)
         self._bgColor = name_to_rgb(bg_color)
         self._textStr = text.strip()
         self._text = self._font.render(self._textStr, True, "white" if self.find_text_color() else "black")
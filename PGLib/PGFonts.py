@@ -0,0 +1,99 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import io
+import os
+
+from typing import Sequence
+from PGLib.PGGlobal import *
+
+
+# @class PGFontRegistry
+# @abstract Shared pygame fonts, created once per face, size and style.
+# @discussion A font is named by a path to a font file, an alias registered for one,
+#             a system family or None for the pygame default. System families are
+#             looked up once; families that are not installed fall back to the default
+#             font. Files of registered fonts are read into memory once, so creating
+#             another size does not touch the disk again. Fonts are shared and their
+#             style attributes must not be changed; ask for a bold or italic font
+#             instead, which uses the family's styled face when it has one.
+
+class PGFontRegistry:
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".fon")
+
+    def __init__(self) -> None:
+        self._fonts = {}
+        self._aliases = {}
+        self._data = {}
+        self._families = {}
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    # @function register
+    # @abstract Makes the font file at @path available as @name and reads it into memory.
+    # @param sizes Sizes to create right away, so that later lookups are free.
+
+    def register(self, name: str, path: str, sizes: Sequence[int] = ()) -> None:
+        path = os.path.abspath(path)
+        self._aliases[name] = path
+        if path not in self._data:
+            with open(path, "rb") as file:
+                self._data[path] = file.read()
+        for size in sizes:
+            self.font(name, size)
+
+    def font(self, name: str = None, size: int = 20, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+        source, synthetic = self._resolve(name, bold, italic)
+        key = (source, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            data = self._data.get(source)
+            font = pygame.font.Font(io.BytesIO(data) if data else source, size)
+            if synthetic:
+                font.bold = bold
+                font.italic = italic
+            self._fonts[key] = font
+        return font
+
+    # Returns the file to load and whether the requested style has to be synthesized.
+
+    def _resolve(self, name: str, bold: bool, italic: bool) -> tuple[str, bool]:
+        if name is None:
+            return None, True
+        if name in self._aliases:
+            return self._aliases[name], True
+        if name.lower().endswith(self.FONT_EXTENSIONS):
+            return name, True
+        key = (name.lower(), bold, italic)
+        if key not in self._families:
+            self._families[key] = pygame.font.match_font(name, bold, italic)
+        path = self._families[key]
+        return path, path is None
+
+    def clear(self) -> None:
+        self._fonts.clear()
+
+
+font_registry = PGFontRegistry()
@@ -22,24 +22,43 @@
 # SOFTWARE.
 #
 
+import math
+
 from PGLib.PGObject import *
 
+# @class PGFrame
+# @abstract Positions a subtree of objects and frames relative to a common origin.
+# @discussion A frame created with @cached set flattens its subtree into one composite
+#             sprite. Its objects are then kept in a private draw group that is only
+#             rendered into the composite, and the composite is drawn and hit-tested
+#             in their place. Any change to an object of the subtree re-renders the
+#             composite once before the next draw; moving the frame itself only moves
+#             the composite. Pointer input still reaches the child under the pointer.
+
 class PGFrame:
     def __init__(self, parent: Union[PGScene, PGFrame], size: tuple[int, int], x: int, y: int,
-                 base: bool = False):
+                 base: bool = False, cached: bool = False):
         self._parent = parent
 
         self.size = size
         self._relPos = (0, 0)
-        self.pos = (x, y)
+        self._absPos = (0, 0)
+        self._worldDirty = True
         self._objects = PGGroup()
+        self._composite = None
         if base:
-            # temporary
-            self._parentObjects = self._objects
+            self._scene = self._parent
+            self._drawGroup = self._objects
         else:
-            self._parentObjects = self._parent.group
+            self._scene = self._parent.scene
+            self._drawGroup = PGGroup() if cached else self._parent.draw_group
         # see if we can optimize this
         self._frames = []
+        self._layout = None
+        self.pos = (x, y)
+        if cached and not base:
+            self._composite = PGFrameComposite(self)
+            self._drawGroup.listen(self._composite.invalidate)
 
         if self._parent and not base:
             self._parent.add_object(self, x, y)
@@ -59,10 +78,21 @@ class PGFrame:
 
     # shrink function
 
-    # Pair with update_pos()
+    # World positions
+    # A frame only stores its position relative to its parent. The absolute position
+    # is cached and recomputed lazily on read after the frame or one of its ancestors
+    # moved. Moving a frame marks its subtree stale, stopping at parts that are already
+    # stale, and queues its objects on the draw group, which places them once right
+    # before the next draw. Several moves within one frame therefore cost one update
+    # of the subtree.
+
     @property
     def abs_pos(self) -> tuple[int, int]:
-        return self._pos
+        if self._worldDirty:
+            parent_pos = self._parent.abs_pos
+            self._absPos = (parent_pos[0] + self._relPos[0], parent_pos[1] + self._relPos[1])
+            self._worldDirty = False
+        return self._absPos
 
     @property
     def pos(self) -> tuple[int, int]:
@@ -70,28 +100,30 @@ class PGFrame:
 
     @pos.setter
     def pos(self, pos: tuple[int, int]) -> None:
-        self._relPos = pos
-        self._pos = (pos[0] + self._parent.pos[0], pos[1] + self._parent.pos[1])
-        if self._pos[0] + self.size[0] > self._parent.pos[0] + self._parent.size[0]:
-            self._pos = (self._parent.pos[0] + self._parent.size[0] - self.size[0], self._pos[1])
-            self._relPos = (self._parent.size[0] - self.size[0], self._pos[1])
-        if self._pos[1] + self.size[1] > self._parent.pos[1] + self._parent.size[1]:
-            self._pos = (self._pos[0], self._parent.pos[1] + self._parent.size[1] - self.size[1])
-            self._relPos = (self._pos[0], self._parent.size[1] - self.size[1])
-        try:
-            for object in self._objects:
-                object.update_pos()
-            for frame in self._frames:
-                frame.update_pos()
-        except AttributeError:
+        parent_size = self._parent.size
+        self._relPos = (min(pos[0], parent_size[0] - self._size[0]), min(pos[1], parent_size[1] - self._size[1]))
+        self._layout = None
+        self._invalidate_world()
+        if self._composite:
+            self._composite.follow()
+        else:
+            self._drawGroup.notify_change()
+
+    def _invalidate_world(self) -> None:
+        if self._worldDirty:
             return
+        self._worldDirty = True
+        for obj in self._objects:
+            obj._invalidate_world()
+        for frame in self._frames:
+            frame._invalidate_world()
 
     def update_pos(self):
         self.pos = self.pos
 
     @property
     def center(self) -> tuple[int, int]:
-        return self._pos[0] + self._size[0] // 2, self._pos[1] + self._size[1] // 2
+        return self._relPos[0] + self._size[0] // 2, self._relPos[1] + self._size[1] // 2
 
     @center.setter
     def center(self, center: tuple[int, int]) -> None:
@@ -100,38 +132,129 @@ class PGFrame:
     def set_pos_prop(self, x: float, y: float) -> None:
         self.pos = (int((self._parent.size[0] - self._size[0]) * x),
                     int((self._parent.size[1] - self._size[1]) * y))
+        self._layout = ("set_pos_prop", x, y)
 
     def set_center_prop(self, x: float, y: float) -> None:
         self.center = (int((self._parent.size[0] - self._size[0]) * x),
                        int((self._parent.size[1] - self._size[1]) * y))
+        self._layout = ("set_center_prop", x, y)
+
+    # @function relayout
+    # @abstract Places the frame and its subtree again after the parent was resized.
+    # @discussion Same rules as PGObject.relayout. Runs once per resize of the scene,
+    #             the moves it causes are applied together before the next draw.
+
+    def relayout(self) -> None:
+        layout = self._layout
+        if layout:
+            getattr(self, layout[0])(layout[1], layout[2])
+        else:
+            self.update_pos()
+        for obj in self._objects:
+            obj.relayout()
+        for frame in self._frames:
+            frame.relayout()
+
+    # Transforms
+    # A cached frame is rotated, scaled and faded as a whole by transforming its
+    # composite, which costs one transform per frame no matter how many objects the
+    # subtree holds. The composite stays centered on the frame. Frames that are not
+    # cached can only be moved.
+
+    @property
+    def angle(self) -> float:
+        return self._composite.angle if self._composite else 0
+
+    @angle.setter
+    def angle(self, angle: float) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.angle = angle
+
+    @property
+    def scale(self) -> float:
+        return self._composite.scale if self._composite else 1
+
+    @scale.setter
+    def scale(self, factor: float) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.scale = factor
+
+    @property
+    def alpha(self) -> int:
+        return self._composite.alpha if self._composite else 255
+
+    @alpha.setter
+    def alpha(self, alpha: int) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.alpha = alpha
+
+    # Animations
+    # Same semantics as the animations of PGObject.
+
+    def move(self, pos: tuple[float, float], time: float = 1, easing: Callable = linear) -> None:
+        animator.add(PGTween(self, "pos", tuple(pos), duration=time, easing=easing))
+
+    def rotate(self, angle: float, time: float = None, easing: Callable = linear) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.rotate(angle, time, easing)
+
+    def zoom(self, factor: float, time: float = None, easing: Callable = linear) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.zoom(factor, time, easing)
+
+    def fade(self, alpha: int, time: float = None, easing: Callable = linear) -> None:
+        assert self._composite, "Frame must be cached!"
+        self._composite.fade(alpha, time, easing)
+
+    def stop_animations(self) -> None:
+        animator.cancel(self)
+        if self._composite:
+            self._composite.stop_animations()
+
+    @property
+    def animating(self) -> bool:
+        return animator.is_animating(self) or bool(self._composite and self._composite.animating)
+
+    @property
+    def scene(self) -> PGScene:
+        return self._scene
 
-    # angle
-    # scale
-    # alpha
-    # animations
+    @property
+    def cached(self) -> bool:
+        return self._composite is not None
 
     @property
     def group(self) -> PGGroup:
         return self._objects
 
+    # @function draw_group
+    # @abstract The group that actually draws the objects of this frame.
+    # @discussion Objects are kept in their own frame's group as well as in the group
+    #             of the scene's base frame, which is the one drawn every frame, or in
+    #             the private group of the closest cached frame above them.
+
+    @property
+    def draw_group(self) -> PGGroup:
+        return self._drawGroup
+
     def add_object(self, obj: Union[PGObject, PGFrame], x: int = 0, y: int = 0):
         if obj.size[0] > self.size[0]:
             self.size = (obj.size[0], self.size[1])
         if obj.size[1] > self.size[1]:
-            self.size = (obj.size[1], self.size[0])
+            self.size = (self.size[0], obj.size[1])
         obj.pos = (x, y)
         obj._parent = self
 
         if obj.name() == "PGObject":
             self._objects.add(obj)
-            self._parentObjects.add(obj)
+            self._drawGroup.add(obj)
         else:
             self._frames.append(obj)
 
     def remove_object(self, obj: Union[PGObject, PGFrame]):
         if obj.name() == "PGObject":
             self._objects.remove(obj)
-            self._parentObjects.add(obj)
+            self._drawGroup.remove(obj)
         else:
             self._frames.remove(obj)
 
@@ -149,9 +272,116 @@ class PGFrame:
 
     # @function process_events
     # @abstract Process all pygame events of its objects.
-    # @discussion This must be overridden if other objects have events as well.
+    # @discussion Objects of nested frames are also held by the draw group, which
+    #             dispatches pointer events for the whole subtree in one hit test.
+    #             This must be overridden if other objects have events as well.
 
     def process_events(self, event: pygame.event.Event) -> None:
-        self._objects.process_events(event)
-        for frame in self._frames:
-            frame.process_events(event)
+        if self._drawGroup is self._objects:
+            self._objects.process_events(event)
+
+
+# @class PGFrameComposite
+# @abstract The sprite drawn in place of a cached frame.
+# @discussion It sits in the frame's parent at the frame's position, so moves of the
+#             frame or of its ancestors only move the composite. Its source image is
+#             the frame's private draw group rendered onto a surface of the frame's
+#             size, rebuilt in place whenever that group reports a change while the
+#             composite is on screen.
+#             The children only live in the private group, so the composite stands in
+#             for them in the parent group: it is active while any of them is, passes
+#             update() calls on to them and hands them the events that are not routed
+#             to a single object by the pointer.
+
+class PGFrameComposite(PGObject):
+    def __init__(self, frame: PGFrame) -> None:
+        self._frame = frame
+        self._stale = True
+        super().__init__(frame._parent, frame.pos[0], frame.pos[1], pygame.Surface(frame.size, pygame.SRCALPHA))
+        frame.draw_group.listen_active(self._sync_active)
+        self._sync_active()
+        self.invalidate()
+
+    @property
+    def frame(self) -> PGFrame:
+        return self._frame
+
+    # @function follow
+    # @abstract Re-centers the composite on its frame after the frame moved.
+
+    def follow(self) -> None:
+        self._invalidate_world()
+        self._changed()
+
+    def _place(self) -> None:
+        parent_x, parent_y = self._parent.abs_pos
+        frame_x, frame_y = self._frame.pos
+        width, height = self._frame.size
+        self.rect.center = (round(parent_x + frame_x + width / 2), round(parent_y + frame_y + height / 2))
+        self._relPos = (self.rect.x - parent_x, self.rect.y - parent_y)
+        self._worldDirty = False
+        self._mark_dirty()
+        self._moved()
+
+    # Only the children and the composite's own animations keep it awake.
+
+    @property
+    def active(self) -> bool:
+        return self._animating or bool(self._frame.draw_group.active_count)
+
+    def update(self, *args, **kwargs) -> None:
+        self._frame.draw_group.update(*args, **kwargs)
+
+    def process_events(self, event: pygame.event.Event) -> None:
+        self._frame.draw_group.dispatch(event)
+
+    def invalidate(self) -> None:
+        if not self._stale:
+            self._stale = True
+            self._mark_dirty()
+        self._parent.draw_group.schedule(self)
+
+    # An off-screen composite is not rendered until it comes back on screen.
+
+    def _resolve(self) -> None:
+        if self._stale and not self._culled:
+            self._render()
+        super()._resolve()
+
+    def _set_culled(self, culled: bool) -> None:
+        super()._set_culled(culled)
+        if not culled and self._stale:
+            self._resolve()
+
+    def _render(self) -> None:
+        group = self._frame.draw_group
+        group.resolve()
+        self._stale = False
+        surface = self._origImage
+        if surface.get_size() != self._frame.size:
+            surface = self._origImage = pygame.Surface(self._frame.size, pygame.SRCALPHA)
+            self.image = surface.subsurface(surface.get_rect())
+            self.rect.size = surface.get_size()
+            self._transformDirty = True
+        surface.fill((0, 0, 0, 0))
+        origin_x, origin_y = self._frame.abs_pos
+        for s in group.sprites():
+            if s.visible:
+                surface.blit(s.image, (s.rect.x - origin_x, s.rect.y - origin_y), s.source_rect, s.blendmode)
+        self.refresh_image()
+
+    # Points are mapped back through the rotation and scale of the composite, so the
+    # children are hit-tested at their untransformed positions.
+
+    def pick(self, p: tuple[int, int]) -> PGObject:
+        if self._scale == 0:
+            return None
+        if self._angle % 360 or self._scale != 1:
+            x, y = p[0] - self.rect.centerx, p[1] - self.rect.centery
+            rad = math.radians(self._angle)
+            cos, sin = math.cos(rad), math.sin(rad)
+            frame_x, frame_y = self._frame.abs_pos
+            width, height = self._frame.size
+            p = (int(frame_x + width / 2 + (x * cos + y * sin) / self._scale),
+                 int(frame_y + height / 2 + (y * cos - x * sin) / self._scale))
+        return self._frame.draw_group.pick(p)
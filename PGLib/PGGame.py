@@ -22,8 +22,18 @@
 # SOFTWARE.
 #
 
+import os
+
+from collections import OrderedDict
+
+from PGLib.PGAssets import PGAssetManager, PGAtlas, PGBundle, asset_manager
 from PGLib.PGButtons import *
+from PGLib.PGFonts import PGFontRegistry, font_registry
 from PGLib.PGFrame import *
+from PGLib.PGPreloader import PGPreloader
+from PGLib.PGProfiler import PGProfiler
+from PGLib.PGReplay import PGEventRecorder, PGEventReplay
+from PGLib.PGSurfacePool import surface_pool
 
 
 class PGScene:
@@ -37,21 +47,82 @@ class PGScene:
 #             but only one scene (the one latest added) will be active. The events and
 #             updates of it are then invoked in the game loop, which should be called outside
 #             to start the game.
+#             A headless game renders into an offscreen surface of a fixed resolution
+#             through SDL's dummy drivers and runs on a virtual clock that advances by
+#             exactly one frame at the target fps per frame, without waiting. Besides
+#             start(), it can be driven frame by frame with step(), which makes runs
+#             reproducible and as fast as the machine allows.
+#             Every frame is timed phase by phase by @self.profiler. @HUD_KEY toggles an
+#             overlay with the statistics, and with @profile_path set they are exported
+#             there when the game quits.
 
 class PGGame:
-    def __init__(self, fps: int = 60) -> None:
+    HEADLESS_RESOLUTION = (960, 540)
+    HUD_KEY = pygame.K_F3
+    HUD_REFRESH = 0.25
+    RESIZE_DEBOUNCE = 0.2
+    LOADING_DELAY = 0.15
+    IDLE_TIMEOUT = 1.0
+
+    def __init__(self, fps: int = 60, dirty_rects: bool = False, update_rate: int = 60,
+                 max_catch_up: int = 5, headless: bool = False, resolution: tuple[int, int] = None,
+                 profile_path: str = None, scene_budget: int = 64 * 1024 * 1024, idle_pacing: bool = True) -> None:
+        self._headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         # Initialize Display
         pygame.init()
         pygame.display.init()
 
         self._monitorWidth = pygame.display.Info().current_w
         self._monitorHeight = pygame.display.Info().current_h
-        self._screen = pygame.display.set_mode((self._monitorWidth / 2, self._monitorHeight / 2),
-                                               pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
+        if headless:
+            self._displayFlags = 0
+            self._screen = pygame.display.set_mode(resolution or self.HEADLESS_RESOLUTION)
+        else:
+            self._displayFlags = pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE
+            self._screen = pygame.display.set_mode(resolution or (self._monitorWidth / 2, self._monitorHeight / 2),
+                                                   self._displayFlags)
+        self._designSize = self._screen.get_size()
+        self._pendingSize = None
+        self._resizeTime = 0.0
         self._fps = fps
+        self._dt = 0.0
+        self._time = 0.0
+        self._frames = 0
+        self._injected = []
+        self._recorder = None
+        self._recordPath = None
+        self._replay = None
+        self._replayFrame = 0
+        self._profiler = PGProfiler(budget=1 / fps)
+        self._profilePath = profile_path
+        self._hudVisible = False
+        self._hudImage = None
+        self._hudRect = None
+        self._hudTime = 0.0
+        self._hudFont = None
+        self._timestep = 1 / update_rate
+        self._maxCatchUp = max_catch_up
+        self._accumulator = 0.0
+        self._interpolation = 0.0
+        self._dirtyRects = dirty_rects
+        self._idlePacing = idle_pacing
+        self._idle = False
+        self._activeFrames = 0
+        self._preloader = PGPreloader()
+        asset_manager.loader = self._preloader.take
+        self._deferred = None
+        self._deferTime = 0.0
+        self._loadingImages = None
+        self._loadingRect = None
 
         # Start with SSMenu
         self._scenes = []
+        self._inactiveScenes = OrderedDict()
+        self._sceneBudget = scene_budget
         self._activeScene = None
         self._prevActiveScene = None
         self._transitionOutComplete = True
@@ -64,6 +135,140 @@ class PGGame:
     def screen(self) -> pygame.Surface:
         return self._screen
 
+    @property
+    def headless(self) -> bool:
+        return self._headless
+
+    # @function design_size
+    # @abstract The window size the game was created with.
+    # @discussion Layouts given in pixels are meant for this size and are scaled by
+    #             PGScene.layout_scale when the window is resized.
+
+    @property
+    def design_size(self) -> tuple[int, int]:
+        return self._designSize
+
+    # @function time
+    # @abstract Seconds the game clock has advanced since the game started.
+    # @discussion Virtual time in headless games, measured time otherwise.
+
+    @property
+    def time(self) -> float:
+        return self._time
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    # Idle pacing
+    # A frame after which nothing is animating, transitioning, loading or waiting to be
+    # drawn, and whose scene is idle, leaves the game idle. An idle game blocks in
+    # pygame.event.wait instead of ticking at full rate, and frames that end the wait
+    # without input are skipped altogether. Input wakes the game at once, and the
+    # frame handling it runs in full. Time spent waiting passes on the game clock but
+    # is not simulated by updates. Headless games, replays and recordings never idle,
+    # since their frames must follow the game clock exactly.
+
+    @property
+    def idle(self) -> bool:
+        return self._idle
+
+    @property
+    def idle_frames(self) -> int:
+        return self._profiler.idle
+
+    @property
+    def active_frames(self) -> int:
+        return self._activeFrames
+
+    @property
+    def preloader(self) -> PGPreloader:
+        return self._preloader
+
+    # Preloading
+    # A scene lists the images it loads in ASSETS. preload() hands them to the worker
+    # of the preloader, typically while the previous scene is on screen, and the scene
+    # takes the finished surfaces when it is created. Images served from a bundle or
+    # an atlas are skipped, they are already decoded, and so are images that are still
+    # cached. Pushing a scene class whose assets are still being decoded does not
+    # block: the push is carried out by the first frame after they are done, and a
+    # loading indicator is shown if that takes longer than LOADING_DELAY seconds.
+    # Headless runs, recordings and replays load synchronously instead, so the frame a
+    # scene appears in does not depend on the speed of the worker.
+
+    def preload(self, scene_class: type) -> None:
+        for asset in scene_class.ASSETS:
+            if not asset_manager.prebuilt(*asset) and not asset_manager.cached(*asset):
+                self._preloader.request(*asset)
+
+    def preloaded(self, scene_class: type) -> bool:
+        return all(self._preloader.ready(*asset) for asset in scene_class.ASSETS)
+
+    @property
+    def loading(self) -> bool:
+        return self._deferred is not None
+
+    def _defer(self, action: Callable, *args) -> bool:
+        scene = args[0]
+        if isinstance(scene, PGScene) or self.preloaded(scene):
+            return False
+        if self._headless or self._recorder or self._replay:
+            return False
+        if not self._deferred:
+            self._deferTime = self._time
+        self._deferred = (action, args)
+        return True
+
+    @property
+    def profiler(self) -> PGProfiler:
+        return self._profiler
+
+    @property
+    def hud_visible(self) -> bool:
+        return self._hudVisible
+
+    @hud_visible.setter
+    def hud_visible(self, visible: bool) -> None:
+        if not visible and self._hudRect and self._activeScene:
+            self._activeScene.draw_group.repaint_rect(self._hudRect)
+            self._hudRect = None
+        self._hudVisible = visible
+        self._hudImage = None
+
+    # @function timestep
+    # @abstract Seconds of game time simulated by every call of PGScene.update.
+
+    @property
+    def timestep(self) -> float:
+        return self._timestep
+
+    # @function interpolation
+    # @abstract How far the current frame lies between the last update and the next one.
+    # @discussion Ranges from 0 to 1. Tweens advance with the updates and are blended
+    #             by the game itself. Scenes that move objects in update() can blend the
+    #             previous and the current state by it when drawing, so motion stays
+    #             smooth when the frame rate differs from the update rate.
+
+    @property
+    def interpolation(self) -> float:
+        return self._interpolation
+
+    # @function dirty_rects
+    # @abstract Whether new scenes only redraw objects that changed since the last frame.
+    # @discussion Scenes may override this through their own constructor argument.
+
+    @property
+    def dirty_rects(self) -> bool:
+        return self._dirtyRects
+
+    # Scene stack
+    # @self._scenes is a stack whose top is the active scene. Scenes popped off it are
+    # kept in @self._inactiveScenes, one per class and least recently used first, and
+    # are reused when a scene of the same class is pushed again, so every class has at
+    # most one instance. Whenever the inactive scenes take more than
+    # @self._sceneBudget bytes, the least recently used ones are disposed of. Scenes
+    # removed from the game are disposed of once their transition out is complete.
+
     # @function add_scene
     # @abstract Appends a new scene to @self._scenes and activate it.
     # @param scene The scene to add.
@@ -79,6 +284,98 @@ class PGGame:
         self._scenes.remove(scene)
         if scene == self._activeScene:
             self.set_active_scene_index(len(self._scenes) - 1, trans_in, trans_out)
+        else:
+            self._retire_scene(scene)
+
+    @property
+    def scenes(self) -> list[PGScene]:
+        return list(self._scenes)
+
+    @property
+    def inactive_scenes(self) -> list[PGScene]:
+        return list(self._inactiveScenes.values())
+
+    # @function push_scene
+    # @abstract Activates @scene on top of the stack and returns it.
+    # @param scene A scene, or a scene class whose existing instance is reused or
+    #              which is constructed with the game as its only argument.
+
+    def push_scene(self, scene: Union[PGScene, type], trans_in: str = "fade", trans_out: str = "fade") -> PGScene:
+        if self._defer(self.push_scene, scene, trans_in, trans_out):
+            return None
+        scene = self._get_scene(scene)
+        self.set_active_scene(scene, trans_in, trans_out)
+        return scene
+
+    # @function pop_scene
+    # @abstract Deactivates the top scene, keeping it for reuse, and activates the next one.
+
+    def pop_scene(self, trans_in: str = "fade", trans_out: str = "fade") -> PGScene:
+        assert len(self._scenes) > 1, "Cannot pop the last scene!"
+        scene = self._scenes.pop()
+        self._keep_scene(scene)
+        self.set_active_scene(self._scenes[-1], trans_in, trans_out)
+        return scene
+
+    # @function replace_scene
+    # @abstract Swaps the top scene for @scene, keeping the old one for reuse.
+
+    def replace_scene(self, scene: Union[PGScene, type], trans_in: str = "fade",
+                      trans_out: str = "fade") -> PGScene:
+        if self._defer(self.replace_scene, scene, trans_in, trans_out):
+            return None
+        top = self._scenes[-1]
+        scene = self._get_scene(scene)
+        if top is not scene:
+            self._scenes.remove(top)
+            self._keep_scene(top)
+        self.set_active_scene(scene, trans_in, trans_out)
+        return scene
+
+    def _get_scene(self, scene: Union[PGScene, type]) -> PGScene:
+        if isinstance(scene, PGScene):
+            if self._inactiveScenes.get(type(scene)) is scene:
+                del self._inactiveScenes[type(scene)]
+                self._scenes.append(scene)
+            return scene
+        for existing in self._scenes:
+            if type(existing) is scene:
+                return existing
+        existing = self._inactiveScenes.pop(scene, None)
+        if existing:
+            self._scenes.append(existing)
+            return existing
+        return scene(self)
+
+    def _keep_scene(self, scene: PGScene) -> None:
+        previous = self._inactiveScenes.pop(type(scene), None)
+        if previous and previous is not scene:
+            self._retire_scene(previous)
+        self._inactiveScenes[type(scene)] = scene
+        self._evict_scenes()
+
+    def _evict_scenes(self) -> None:
+        total = sum(scene.memory_size for scene in self._inactiveScenes.values())
+        for scene_class, scene in list(self._inactiveScenes.items()):
+            if total <= self._sceneBudget:
+                return
+            if scene is self._prevActiveScene:
+                continue
+            del self._inactiveScenes[scene_class]
+            total -= scene.memory_size
+            scene.dispose()
+
+    # Disposes of @scene unless it is still in use or still transitioning out.
+
+    def _retire_scene(self, scene: PGScene) -> None:
+        if scene is self._prevActiveScene and not self._transitionOutComplete:
+            return
+        if scene in self._scenes:
+            return
+        if self._inactiveScenes.get(type(scene)) is scene:
+            self._evict_scenes()
+            return
+        scene.dispose()
 
     # set_level
     # eliminate all scenes above @level and activate it thereafter
@@ -86,6 +383,12 @@ class PGGame:
     def set_active_scene(self, scene: PGScene, trans_in: str = "fade", trans_out: str = "fade") -> None:
         assert scene, "Scene must be valid!"
         assert scene in self._scenes, "Scene must be contained!"
+        if self._scenes[-1] is not scene:
+            self._scenes.remove(scene)
+            self._scenes.append(scene)
+        if scene.layout_size != self._screen.get_size():
+            scene.resize(self._screen.get_size())
+        scene.redraw()
         if self._activeScene:
             self._activeScene.transition_out_method = trans_out
             self._transitionOutComplete = False
@@ -98,42 +401,268 @@ class PGGame:
         self.set_active_scene(self._scenes[index], trans_in, trans_out)
 
     # main game loop
-    # processes & updates the active scene every frame
+    # processes & draws the active scene every frame
+    # Game logic runs at a fixed rate independent of the frame rate: the time measured
+    # by the clock is accumulated and PGScene.update is called once per elapsed
+    # timestep. A slow frame is caught up with several updates, at most
+    # @self._maxCatchUp, beyond which the backlog is dropped and the game slows down
+    # instead of spiraling. Animations advance with the updates.
 
     def _game_loop(self) -> None:
-        while True:
-            for event in pygame.event.get():
-                if self._activeScene:
-                    self._activeScene.process_events(event)
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-                if event.type == pygame.VIDEORESIZE:
-                    self._screen = pygame.display.set_mode((event.w, event.h),
-                                                           pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE)
-
-            scene = self._activeScene
-            if not scene:
-                return
+        while self._run_frame():
+            pass
+
+    # Runs one iteration of the game loop. Returns False once the game has quit or
+    # has no scene left.
+
+    def _run_frame(self) -> bool:
+        profiler = self._profiler
+        idle_events = self._wait_events() if self._idle else None
+        if idle_events == []:
+            profiler.idle_frame()
+            return True
+        profiler.begin_frame()
+        if idle_events:
+            events = idle_events
+        elif self._replay:
+            # Real input would make the replay diverge; only closing the window is honored
+            events = self._replay.events(self._replayFrame)
+            events += [event for event in pygame.event.get() if event.type == pygame.QUIT]
+            self._replayFrame += 1
+        else:
+            events = self._injected + pygame.event.get()
+            self._injected = []
+        if self._recorder:
+            self._recorder.begin_frame(events)
+        profiler.mark("events")
+        for event in events:
+            if self._activeScene:
+                self._activeScene.process_events(event)
+            if event.type == pygame.QUIT:
+                self.quit()
+                return False
+            if event.type == pygame.VIDEORESIZE:
+                self._pendingSize = (event.w, event.h)
+                self._resizeTime = self._time
+            if event.type == pygame.KEYDOWN and event.key == self.HUD_KEY:
+                self.hud_visible = not self._hudVisible
+        if self._pendingSize and self._time - self._resizeTime >= self.RESIZE_DEBOUNCE:
+            self._resize(self._pendingSize)
+        if self._deferred and self.preloaded(self._deferred[1][0]):
+            action, args = self._deferred
+            self._deferred = None
+            action(*args)
+        profiler.mark("process_events")
+
+        scene = self._activeScene
+        if not scene:
+            return False
+        self._frames += 1
+
+        if not self._transitionOutComplete:
+            scene = self._prevActiveScene
+            self._transitionOutComplete = scene.transition_out()
+            if self._transitionOutComplete:
+                if not self._activeScene.background_set():
+                    self._activeScene.capture_background(self._screen)
+                self._retire_scene(scene)
+                profiler.mark("transition")
+                profiler.end_frame()
+                return True  # Do not update after transition out is complete to prevent "flashing"
+        elif not self._transitionInComplete:
+            self._transitionInComplete = scene.transition_in()
+        profiler.mark("transition")
+
+        self._fixed_update(scene)
+        profiler.mark("update")
+        if self._hudVisible and self._hudRect:
+            scene.draw_group.repaint_rect(self._hudRect)
+        if self._loadingRect:
+            scene.draw_group.repaint_rect(self._loadingRect)
+            self._loadingRect = None
+        rects = scene.draw()
+        if self._hudVisible:
+            rects.append(self._draw_hud())
+        if self._deferred and self._time - self._deferTime >= self.LOADING_DELAY:
+            rects.append(self._draw_loading())
+        profiler.mark("draw")
+        pygame.display.update(rects)
+        profiler.mark("present")
+        profiler.end_frame()
+        self._activeFrames += 1
+        self._idle = self._can_idle(scene, rects)
+        self._dt = self._tick()
+        self._time += self._dt
+        self._accumulator += self._dt
+        return True
+
+    # Resizing
+    # Dragging a window edge reports a stream of sizes. Only the last one is applied,
+    # once no new size arrived for RESIZE_DEBOUNCE seconds, so layouts and scaled
+    # images are rebuilt once per resize. Scenes that are not on screen are resized
+    # when they become active again.
+
+    def _resize(self, size: tuple[int, int]) -> None:
+        self._pendingSize = None
+        if size != self._screen.get_size():
+            self._screen = pygame.display.set_mode(size, self._displayFlags)
+        for scene in (self._activeScene, self._prevActiveScene):
+            if scene and scene in self._scenes and scene.layout_size != size:
+                scene.resize(size)
+        self._hudRect = None
+        self._loadingRect = None
+
+    # The overlay is drawn on top of the scene after it drew. Its area is handed back
+    # to the scene's draw group before the next draw so that the scene repaints it.
+
+    def _draw_hud(self) -> pygame.Rect:
+        if not self._hudImage or self._time - self._hudTime >= self.HUD_REFRESH:
+            if not self._hudFont:
+                self._hudFont = font_registry.font(None, 18)
+            self._hudImage = self._profiler.render_hud(self._hudFont)
+            self._hudTime = self._time
+        rect = self._screen.blit(self._hudImage, (4, 4))
+        self._hudRect = rect.union(self._hudRect) if self._hudRect else rect
+        return self._hudRect
 
-            if not self._transitionOutComplete:
-                scene = self._prevActiveScene
-                self._transitionOutComplete = scene.transition_out()
-                if self._transitionOutComplete:
-                    if not self._activeScene.background_set():
-                        self._activeScene.background = self._screen.copy()
-                        self._activeScene.update_background()
-                    continue  # Do not update after transition out is complete to prevent "flashing"
-            elif not self._transitionInComplete:
-                self._transitionInComplete = scene.transition_in()
-
-            scene.update()
-            scene.draw()
-            clock.tick(self._fps)
+    def _can_idle(self, scene: PGScene, rects: list[pygame.Rect]) -> bool:
+        return (self._idlePacing and not rects and scene.idle and not animator.active
+                and self._transitionInComplete and self._transitionOutComplete
+                and not self._deferred and not self._pendingSize and not self._hudVisible
+                and not self._headless and not self._replay and not self._recorder and not self._injected)
+
+    # Waits for input at most IDLE_TIMEOUT seconds and returns what arrived.
+
+    def _wait_events(self) -> list[pygame.event.Event]:
+        event = pygame.event.wait(round(self.IDLE_TIMEOUT * 1000))
+        events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+        self._time += clock.tick() / 1000
+        self._dt = 0.0
+        self._idle = not events
+        return events
+
+    # The loading indicator cycles through a few pre-rendered frames in the bottom
+    # right corner and is cleared the same way as the overlay.
+
+    def _draw_loading(self) -> pygame.Rect:
+        if not self._loadingImages:
+            font = font_registry.font(None, 28)
+            self._loadingImages = [font.render("Loading" + "." * i, True, (255, 255, 255), (0, 0, 0))
+                                   for i in range(4)]
+        image = self._loadingImages[int((self._time - self._deferTime) * 4) % len(self._loadingImages)]
+        width, height = self._screen.get_size()
+        self._loadingRect = self._screen.blit(image, (width - self._loadingImages[-1].get_width() - 8,
+                                                      height - image.get_height() - 8))
+        return self._loadingRect
+
+    def _tick(self) -> float:
+        if self._replay:
+            dt = self._replay.frame_time(self._replayFrame - 1)
+        elif self._headless:
+            dt = 1 / self._fps
+        else:
+            dt = clock.tick(self._fps) / 1000
+        if self._recorder:
+            self._recorder.end_frame(dt)
+        return dt
+
+    def _fixed_update(self, scene: PGScene) -> None:
+        steps = 0
+        while self._accumulator >= self._timestep:
+            if steps == self._maxCatchUp:
+                self._accumulator %= self._timestep
+                break
+            animator.update(self._timestep)
+            scene.update(self._timestep)
+            self._accumulator -= self._timestep
+            steps += 1
+        self._interpolation = self._accumulator / self._timestep
+        if self._accumulator:
+            animator.blend(self._accumulator)
 
     def start(self):
         self._game_loop()
 
+    # @function quit
+    # @abstract Shuts the game down as closing the window does.
+    # @discussion Exports the profile to @profile_path, stops the preloader, saves a
+    #             running recording and quits pygame. Scenes that end the game
+    #             themselves must call this before exiting.
+
+    def quit(self) -> None:
+        if self._profilePath:
+            self._profiler.export(self._profilePath)
+        self._preloader.shutdown()
+        if self._recorder:
+            self.stop_recording()
+        pygame.quit()
+
+    # @function inject
+    # @abstract Queues a synthetic event that is handled before all others next frame.
+
+    def inject(self, event: pygame.event.Event) -> None:
+        self._injected.append(event)
+        self._idle = False
+
+    # @function step
+    # @abstract Runs @n frames of the game loop and returns how many actually ran.
+    # @discussion @events are injected before the first frame. Fewer frames run if
+    #             the game quits or runs out of scenes.
+
+    def step(self, n: int = 1, events: Sequence[pygame.event.Event] = ()) -> int:
+        self._injected.extend(events)
+        self._idle = self._idle and not events
+        for i in range(n):
+            if not self._run_frame():
+                return i
+        return n
+
+    # Recording and replay
+    # A recording captures the input events the loop consumes and the length of every
+    # frame, see PGReplay. Replaying it from the same starting scene feeds the events
+    # back in the same frames and runs the game clock on the recorded frame lengths
+    # without waiting, so the game takes the same path at full speed. A profiler of its
+    # own covers the whole replay, and its report can be compared across builds with
+    # PGReplay.compare_reports. The game's profiler is restored afterwards.
+
+    @property
+    def recording(self) -> bool:
+        return self._recorder is not None
+
+    def record(self, path: str) -> None:
+        self._idle = False
+        self._recorder = PGEventRecorder(self._fps, self._screen.get_size())
+        self._recordPath = path
+
+    def stop_recording(self) -> None:
+        assert self._recorder, "Game must be recording!"
+        self._recorder.save(self._recordPath)
+        self._recorder = None
+        self._recordPath = None
+
+    # @function replay
+    # @abstract Runs the recording at @path and returns the timing summary.
+    # @param report_path Where to export the timing report, see PGProfiler.export.
+
+    def replay(self, path: str, report_path: str = None) -> dict:
+        replay = PGEventReplay(path)
+        if replay.size != self._screen.get_size():
+            self._resize(replay.size)
+        profiler = self._profiler
+        self._profiler = PGProfiler(capacity=max(1, replay.frames), budget=1 / replay.fps)
+        self._replay = replay
+        self._replayFrame = 0
+        self._idle = False
+        try:
+            while self._replayFrame < replay.frames and self._run_frame():
+                pass
+        finally:
+            self._replay = None
+            profiler, self._profiler = self._profiler, profiler
+        if report_path:
+            profiler.export(report_path)
+        return profiler.summary()
+
 
 # @class PGScene
 # @abstract Base class for all scene objects in the game.
@@ -146,15 +675,27 @@ class PGGame:
 #             would be handled from within.
 
 class PGScene:
-    def __init__(self, game: PGGame, bg: pygame.Surface = None):
+    # Images the scene loads with load_image(), as (path, size) pairs, size None for
+    # the original size. See PGGame.preload.
+    ASSETS = ()
+
+    def __init__(self, game: PGGame, bg: pygame.Surface = None, dirty_rects: bool = None):
         self._game = game
         self._game.add_scene(self)
         self._screen = self._game.screen
+        self._dirtyRects = game.dirty_rects if dirty_rects is None else dirty_rects
         self._frame = PGFrame(self, self._screen.get_size(), 0, 0, True)
         self._transitionInMethod = "none"
         self._transitionOutMethod = "none"
         self._veil = None
+        self._veilImage = None
+        self._veilActive = False
+        self._hiddenAlphas = {}
+        self._crossfadeAlpha = None
+        self._crossfadeFrom = None
+        self._crossfadeTo = None
         self._background = None
+        self._backgroundSource = None
         self._backgroundSet = False
         self.background = bg
         self.update_background()
@@ -163,6 +704,41 @@ class PGScene:
     def size(self) -> tuple[int, int]:
         return pygame.display.get_surface().get_size()
 
+    # @function layout_size
+    # @abstract The screen size the objects of the scene are currently laid out for.
+
+    @property
+    def layout_size(self) -> tuple[int, int]:
+        return self._frame.size
+
+    # @function layout_scale
+    # @abstract Factor from the design size of the game to the current layout.
+    # @discussion The smaller of the two axis ratios, so that anything sized with it
+    #             still fits the screen.
+
+    @property
+    def layout_scale(self) -> float:
+        design_w, design_h = self._game.design_size
+        width, height = self._frame.size
+        return min(width / design_w, height / design_h)
+
+    # @function resize
+    # @abstract Lays the scene out again for a screen of @size.
+    # @discussion A background passed to the scene is scaled from the original image
+    #             through the transform cache, so returning to an earlier size reuses
+    #             the earlier result. Objects are then placed again by relayout().
+
+    def resize(self, size: tuple[int, int]) -> None:
+        self._screen = self._game.screen
+        self._frame.size = size
+        if self._backgroundSet:
+            self._background = transform_cache.resize(self._backgroundSource, size)
+        elif self._background.get_size() != size:
+            self._background = pygame.transform.smoothscale(self._background, size)
+        self.update_background()
+        self._frame.relayout()
+        self.redraw()
+
     @property
     def pos(self) -> tuple[int, int]:
         try:
@@ -170,9 +746,35 @@ class PGScene:
         except AttributeError:
             return (0, 0)
 
+    @property
+    def abs_pos(self) -> tuple[int, int]:
+        return (0, 0)
+
     def name(self):
         return "PGScene"
 
+    @property
+    def scene(self) -> PGScene:
+        return self
+
+    @property
+    def dirty_rects(self) -> bool:
+        return self._dirtyRects
+
+    # @function pixels_updated
+    # @abstract Number of pixels pushed to the display by the last draw.
+
+    @property
+    def pixels_updated(self) -> int:
+        return self._frame.group.pixels_updated
+
+    # @function culled_count
+    # @abstract Number of objects left out of the last draw because they were off screen.
+
+    @property
+    def culled_count(self) -> int:
+        return self._frame.group.culled_count
+
     @property
     def transition_in_method(self) -> str:
         return self._transitionInMethod
@@ -193,6 +795,10 @@ class PGScene:
     def group(self) -> PGGroup:
         return self._frame.group
 
+    @property
+    def draw_group(self) -> PGGroup:
+        return self._frame.draw_group
+
     def add_object(self, obj: PGObject, x: int = 0, y: int = 0):
         self._frame.add_object(obj)
         obj.pos = [x, y]
@@ -208,6 +814,7 @@ class PGScene:
     def background(self, bg: pygame.Surface = None) -> None:
         if bg:
             self._background = bg
+            self._backgroundSource = bg
             self._backgroundSet = True
         else:
             self._background = pygame.Surface(pygame.display.get_surface().get_size()).convert_alpha()
@@ -219,6 +826,55 @@ class PGScene:
     def update_background(self) -> None:
         self._frame.group.clear(pygame.display.get_surface(), self._background)
 
+    # @function capture_background
+    # @abstract Uses the current content of @surface as the background.
+    # @discussion For scenes without a background of their own, which show whatever was
+    #             on screen when they became active. The pixels are copied into the
+    #             surface the scene already holds whenever the size allows.
+
+    def capture_background(self, surface: pygame.Surface) -> None:
+        if self._background and self._background.get_size() == surface.get_size():
+            self._background.blit(surface, (0, 0))
+        else:
+            self._background = surface.copy()
+        self.update_background()
+
+    # @function redraw
+    # @abstract Repaints the whole screen on the next draw.
+    # @discussion Needed when the scene is shown again after another one drew over it.
+
+    def redraw(self) -> None:
+        self._frame.group.repaint_rect(pygame.display.get_surface().get_rect())
+
+    # @function memory_size
+    # @abstract Estimated bytes held by the background and the images of the scene.
+
+    @property
+    def memory_size(self) -> int:
+        surfaces = {}
+        for s in self._frame.group.sprites():
+            image = s.image.get_parent() or s.image
+            surfaces[id(image)] = image
+            if isinstance(s, PGObject):
+                surfaces[id(s._origImage)] = s._origImage
+        if self._background:
+            surfaces[id(self._background)] = self._background
+        return sum(PGTransformCache.surface_bytes(surface) for surface in surfaces.values())
+
+    # @function dispose
+    # @abstract Releases the objects and surfaces of a scene that is no longer used.
+
+    def dispose(self) -> None:
+        for s in self._frame.group.sprites():
+            s.kill()
+        self._veil = None
+        self._veilImage = None
+        self._veilActive = False
+        if self._backgroundSource:
+            transform_cache.discard(self._backgroundSource)
+        self._background = None
+        self._backgroundSource = None
+
     @property
     def game(self) -> PGGame:
         return self._game
@@ -244,23 +900,51 @@ class PGScene:
 
     # @function update
     # @abstract Update all objects in the scene.
-    # @discussion Must be overridden if there are other objects (such as fader, background).
+    # @discussion Called at the fixed update rate of the game with @dt, the seconds of
+    #             game time to advance. Must be overridden if there are other objects
+    #             (such as fader, background).
+
+    def update(self, dt: float) -> None:
+        self._frame.group.update(dt)
+
+    # @function idle
+    # @abstract Whether the scene can rest until the next input.
+    # @discussion True while none of its objects needs per-frame updates. Scenes that
+    #             override update() are never idle unless they override this as well.
+
+    @property
+    def idle(self) -> bool:
+        return self._frame.group.active_count == 0 and type(self).update is PGScene.update
 
-    def update(self) -> None:
-        self._frame.group.update()
+    # @function draw
+    # @abstract Draws the scene and returns the screen areas that changed.
+    # @discussion The game presents the returned rects after its overlays are drawn.
 
-    def draw(self) -> None:
-        pygame.display.update(self._frame.group.draw(pygame.display.get_surface()))
+    def draw(self) -> list[pygame.Rect]:
+        screen = pygame.display.get_surface()
+        if self._crossfadeAlpha is not None:
+            return self._draw_crossfade(screen)
+        return self._frame.group.draw(screen)
+
+    # @function load_image
+    # @abstract Returns the shared image at @path, scaled to @size if given.
+    # @discussion Served by the asset manager, which takes images the game preloaded
+    #             from the preloader and decodes all others on the spot.
+
+    def load_image(self, path: str, size: tuple[int, int] = None, variant: str = None,
+                   build: Callable = None, alpha: bool = True) -> pygame.Surface:
+        return asset_manager.image(path, size, variant, build, alpha)
 
     @staticmethod
     def fit_image(img_path: str, size: (int, int)) -> pygame.Surface:
         return pygame.transform.smoothscale(pygame.image.load(img_path), size)
 
-    #
-    # TO-DO: Once PGFrame is complete, these can be simplified
-    #        by simply calling animation functions of the base
-    #        frame.
-    #
+    # Transitions
+    # Every scene keeps one veil object, created by its first transition and hidden in
+    # between. Its images are full-screen surfaces from the shared surface pool, the
+    # black fill for fades and a snapshot of the screen for zooms, so transitions after
+    # the first allocate nothing. A cross-fade blends a snapshot of the previous screen
+    # over a snapshot of this scene, taken once, instead of drawing the scene under it.
 
     def transition_in(self) -> bool:
         if self._transitionInMethod == "fade":
@@ -269,20 +953,36 @@ class PGScene:
             res = self._transition_fade_alpha(True, 128)
         elif self._transitionInMethod == "zoom":
             res = self._transition_in_zoom()
+        elif self._transitionInMethod == "crossfade":
+            return self._transition_in_crossfade()
         else:
             return True
         if res:
-            self._veil.kill()
-            self._veil = None
+            self._hide_veil()
         return res
 
-    def _transition_fade_alpha(self, is_in: bool, alpha: int) -> bool:
+    def _show_veil(self, img: pygame.Surface) -> PGObject:
         if not self._veil:
-            veil_img = pygame.Surface(self._screen.get_size(), pygame.SRCALPHA)
-            veil_img.fill((0, 0, 0))
-            self._veil = PGObject(self, 0, 0, img=veil_img)
-            self._veil.alpha = alpha if is_in else 0
-            self._veil.fade(0 if is_in else alpha)
+            self._veil = PGObject(self, 0, 0, img=img)
+        else:
+            if img is not self._veilImage:
+                self._veil.img = img
+            self._veil.visible = 1
+            self._frame.group.move_to_front(self._veil)
+        self._veilImage = img
+        self._veilActive = True
+        return self._veil
+
+    def _hide_veil(self) -> None:
+        self._veil.visible = 0
+        self._veilActive = False
+
+    def _transition_fade_alpha(self, is_in: bool, alpha: int) -> bool:
+        if not self._veilActive:
+            veil = self._show_veil(surface_pool.filled(self._screen.get_size(), (0, 0, 0)))
+            veil.scale = 1
+            veil.alpha = alpha if is_in else 0
+            veil.fade(0 if is_in else alpha)
             return False
 
         if is_in:
@@ -290,20 +990,49 @@ class PGScene:
         return self._veil.alpha == alpha
 
     def _transition_in_zoom(self) -> bool:
-        if not self._veil:
-            self._veil = PGObject(self, 0, 0, img=self._screen.convert_alpha().copy())
-            self._veil.scale = 0
-            for s in self._objects.sprites():
-                s.alpha = 0
-            self._veil.zoom(1)
+        if not self._veilActive:
+            veil = self._show_veil(surface_pool.snapshot("zoom", self._screen, alpha=True))
+            veil.refresh_image()
+            veil.alpha = 255
+            veil.scale = 0
+            for s in self._frame.group.sprites():
+                if s is not veil:
+                    self._hiddenAlphas[s] = s.alpha
+                    s.alpha = 0
+            veil.zoom(1)
             return False
 
         if self._veil.scale == 1:
-            for s in self._objects.sprites():
-                s.alpha = 255
+            for s, alpha in self._hiddenAlphas.items():
+                s.alpha = alpha
+            self._hiddenAlphas.clear()
             return True
         return False
 
+    def _transition_in_crossfade(self) -> bool:
+        if self._crossfadeAlpha is None:
+            screen = pygame.display.get_surface()
+            self._crossfadeFrom = surface_pool.snapshot("crossfade_from", screen)
+            self.redraw()
+            self._frame.group.draw(screen)
+            self._crossfadeTo = surface_pool.snapshot("crossfade_to", screen)
+            self._crossfadeAlpha = 255
+            animator.add(PGTween(self, "_crossfadeAlpha", 0, speed=PGObject.FADE_SPEED, convert=round))
+            return False
+
+        if self._crossfadeAlpha == 0:
+            self._crossfadeAlpha = None
+            self._crossfadeFrom.set_alpha(None)
+            self.redraw()
+            return True
+        return False
+
+    def _draw_crossfade(self, screen: pygame.Surface) -> list[pygame.Rect]:
+        self._crossfadeFrom.set_alpha(self._crossfadeAlpha)
+        screen.blit(self._crossfadeTo, (0, 0))
+        screen.blit(self._crossfadeFrom, (0, 0))
+        return [screen.get_rect()]
+
     def transition_out(self) -> bool:
         if self._transitionOutMethod == "fade":
             res = self._transition_fade_alpha(False, 255)
@@ -314,6 +1043,5 @@ class PGScene:
         else:
             return True
         if res:
-            self._veil.kill()
-            self._veil = None
+            self._hide_veil()
         return res
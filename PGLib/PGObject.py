@@ -22,11 +22,12 @@
 # SOFTWARE.
 #
 
-import math
-
 from typing import Union, Sequence, Callable
 from pygame.mask import from_surface
 from PGLib.PGGlobal import *
+from PGLib.PGTransformCache import PGTransformCache, transform_cache
+from PGLib.PGAnimation import *
+from PGLib.PGSpatialIndex import PGSpatialGrid
 
 
 class PGScene:
@@ -39,40 +40,40 @@ class PGFrame:
 
 class PGObject(pygame.sprite.DirtySprite):
     def __init__(self, parent: Union[PGScene, PGFrame], x: int = 0, y: int = 0, img: pygame.Surface = None) -> None:
+        self._groups = []
+        self._awake = type(self).update is not PGObject.update
+        self._animating = False
         super().__init__()
         if parent.name() == "PGFrame":
             self._parent = parent
         else:
             self._parent = parent._frame
 
-        self.dirty = 2
+        # Scenes in dirty rect mode only redraw objects that changed since the last frame.
+        self.dirty = 1 if self._parent.scene.dirty_rects else 2
         self._clickDownAction = None
         self._clickUpAction = None
         self._isClicked = False
         self._hoverOnAction = None
         self._hoverOffAction = None
+        self._dragAction = None
         self._isOn = False
-        if not img:
-            self.image = pygame.Surface((0, 0), pygame.SRCALPHA)
-            self._origImage = None
-            self._imageSet = False
-        else:
-            self.image = img.convert_alpha()
-            self._origImage = img
-            self._imageSet = True
-
-        self.rect = self.image.get_rect(topleft=(x, y))
-        self._relPos = (0, 0)
-        self._posChanges = []
-
         self._angle = 0
-        self._angleChanges = []
-
         self._scale = 1
-        self._scaleChanges = []
-
         self._alpha = 255
-        self._alphaChanges = []
+        self._transformDirty = False
+        self._alphaDirty = False
+        self._worldDirty = False
+        self._culled = False
+        self._layout = None
+        self._origImage = self._prepare_image(img if img else pygame.Surface((0, 0), pygame.SRCALPHA))
+        self.image = self._origImage.subsurface(self._origImage.get_rect())
+
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self._mask = None
+        self._maskImage = None
+        self._useMask = False
+        self._relPos = (0, 0)
 
         if self._parent:
             self._parent.add_object(self, x, y)
@@ -80,62 +81,243 @@ class PGObject(pygame.sprite.DirtySprite):
     def name(self) -> str:
         return "PGObject"
 
+    # Transform pipeline
+    # Setting img, angle, scale or alpha only records the new value. The displayed
+    # image is rebuilt at most once per frame by _resolve(), either when the
+    # draw group resolves its pending objects right before drawing or when the
+    # image or size is read. Moves of an ancestor frame are applied the same way.
+    # The source is rotated and scaled in a single pass through the transform cache,
+    # and alpha is applied to a subsurface view of the result, so an alpha-only
+    # change never touches any pixels.
+
     @property
     def img(self) -> pygame.Surface:
+        self._resolve()
         return self.image
 
+    # Sets the source image. Current angle, scale and alpha are applied on top of it.
+
     @img.setter
     def img(self, img: pygame.Surface) -> None:
-        img = img.convert_alpha()
-        if not self._imageSet:
-            self._origImage = img
-            self._imageSet = True
-        self.image = img
-        self.rect = img.get_rect(center=self.rect.center)
+        self._origImage = self._prepare_image(img)
+        self._invalidate_transform()
+
+    # Surfaces already in 32-bit per-pixel alpha format are used as they are;
+    # anything else is converted once, when it becomes the source image.
+
+    @staticmethod
+    def _prepare_image(img: pygame.Surface) -> pygame.Surface:
+        if img.get_flags() & pygame.SRCALPHA and img.get_bitsize() == 32:
+            return img
+        return img.convert_alpha()
+
+    def _invalidate_transform(self) -> None:
+        if not self._transformDirty:
+            self._transformDirty = True
+            self._parent.draw_group.schedule(self)
+            self._changed()
+
+    def _invalidate_alpha(self) -> None:
+        if not self._alphaDirty:
+            self._alphaDirty = True
+            self._parent.draw_group.schedule(self)
+            self._changed()
+
+    def _invalidate_world(self) -> None:
+        if not self._worldDirty:
+            self._worldDirty = True
+            self._parent.draw_group.schedule(self)
+
+    def _resolve(self) -> None:
+        if self._worldDirty:
+            self._place()
+        if self._transformDirty:
+            if self._angle % 360 == 0 and self._scale == 1:
+                surface = self._origImage
+            else:
+                surface = transform_cache.transform(self._origImage, self._angle, self._scale)
+            self.image = surface.subsurface(surface.get_rect())
+            x, y = self.rect.topleft
+            self.rect = self.image.get_rect(center=self.rect.center)
+            self._relPos = (self._relPos[0] + self.rect.x - x, self._relPos[1] + self.rect.y - y)
+            self._alphaDirty = self._alpha != 255
+            self._transformDirty = False
+            self._mark_dirty()
+            self._moved()
+        if self._alphaDirty:
+            self.image.set_alpha(self._alpha)
+            self._alphaDirty = False
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        if self.dirty < 2:
+            self.dirty = 1
+
+    # Tells the draw group that this object looks different, as opposed to only being
+    # carried along by a moving ancestor. Cached frames rebuild their composite on it.
+
+    def _changed(self) -> None:
+        self._parent.draw_group.notify_change()
+
+    def _set_visible(self, val: int) -> None:
+        super()._set_visible(val)
+        if self._groups:
+            self._changed()
+
+    # Keeps the spatial index of every PGGroup holding this object in sync with its rect.
+
+    def _moved(self) -> None:
+        for group in self._groups:
+            group.reindex(self)
+
+    def add_internal(self, group: pygame.sprite.AbstractGroup) -> None:
+        super().add_internal(group)
+        if isinstance(group, PGGroup):
+            self._groups.append(group)
+            group.set_active(self, self.active)
+
+    def remove_internal(self, group: pygame.sprite.AbstractGroup) -> None:
+        super().remove_internal(group)
+        if group in self._groups:
+            self._groups.remove(group)
+
+    # @function use_mask
+    # @abstract Whether the object is hit only on the opaque pixels of @self.mask.
+    # @discussion Off by default: any point inside the rect hits the object, which
+    #             keeps thin line-art icons easy to click.
+
+    @property
+    def use_mask(self) -> bool:
+        return self._useMask
+
+    @use_mask.setter
+    def use_mask(self, use: bool) -> None:
+        self._useMask = use
+
+    # @function mask
+    # @abstract Hit-test mask of the current image, used when @self.use_mask is set.
+    # @discussion The mask is built lazily and kept until @self.image is replaced, which
+    #             only happens when img, angle or scale produce new pixels. Changing alpha
+    #             only touches the surface alpha, which from_surface ignores, so it keeps
+    #             the mask. Call invalidate_mask() after drawing onto @self.image in place.
+    #             Transparent areas enclosed by the shape, such as the inside of an
+    #             outlined icon, count as part of it.
+
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        self._resolve()
+        if self._mask is None or self._maskImage is not self.image:
+            self._mask = self._solid_mask(from_surface(self.image))
+            self._maskImage = self.image
+        return self._mask
+
+    @staticmethod
+    def _solid_mask(mask: pygame.mask.Mask) -> pygame.mask.Mask:
+        w, h = mask.get_size()
+        if not w or not h:
+            return mask
+        holes = mask.copy()
+        holes.invert()
+        outside = pygame.mask.Mask((w, h))
+        border = [(x, y) for x in range(w) for y in (0, h - 1)] + [(x, y) for y in range(h) for x in (0, w - 1)]
+        for p in border:
+            if holes.get_at(p) and not outside.get_at(p):
+                outside.draw(holes.connected_component(p), (0, 0))
+        outside.invert()
+        return outside
+
+    def invalidate_mask(self) -> None:
+        self._mask = None
+        self._maskImage = None
+
+    # @function refresh_image
+    # @abstract Must be called after drawing onto the source image in place.
+
+    def refresh_image(self) -> None:
+        transform_cache.discard(self._origImage)
+        self.invalidate_mask()
+        if self._angle % 360 != 0 or self._scale != 1:
+            self._invalidate_transform()
+        self._mark_dirty()
+        self._changed()
 
     @property
     def size(self) -> tuple[int, int]:
+        self._resolve()
         return self.rect.size
 
     # Pair with update_pos()
     @property
     def abs_pos(self) -> tuple[int, int]:
+        if self._worldDirty:
+            self._place()
         return self.rect.topleft
 
     @property
     def pos(self) -> tuple[int, int]:
         return self._relPos
 
+    # Positions may be fractional so that animations do not accumulate rounding
+    # errors; the rect is placed on the nearest pixel.
+
     @pos.setter
-    def pos(self, pos: tuple[int, int]) -> None:
-        self._relPos = pos
-        self.rect.topleft = (pos[0] + self._parent.abs_pos[0], pos[1] + self._parent.abs_pos[1])
-        if self.rect.x + self.rect.width > self._parent.abs_pos[0] + self._parent.size[0]:
-            self.rect.x = self._parent.abs_pos[0] + self._parent.size[0] - self.rect.width
-            self._relPos = (self._parent.size[0] - self.rect.width, self._relPos[1])
-        if self.rect.y + self.rect.height > self._parent.abs_pos[1] + self._parent.size[1]:
-            self.rect.y = self._parent.abs_pos[1] + self._parent.size[1] - self.rect.height
-            self._relPos = (self._relPos[0], self._parent.size[1] - self.rect.height)
+    def pos(self, pos: tuple[float, float]) -> None:
+        self._relPos = tuple(pos)
+        self._layout = None
+        self._place()
+        self._changed()
+
+    def _place(self) -> None:
+        parent_x, parent_y = self._parent.abs_pos
+        parent_w, parent_h = self._parent.size
+        rect = self.rect
+        rect.topleft = (round(self._relPos[0] + parent_x), round(self._relPos[1] + parent_y))
+        if rect.right > parent_x + parent_w:
+            rect.x = parent_x + parent_w - rect.width
+            self._relPos = (parent_w - rect.width, self._relPos[1])
+        if rect.bottom > parent_y + parent_h:
+            rect.y = parent_y + parent_h - rect.height
+            self._relPos = (self._relPos[0], parent_h - rect.height)
+        self._worldDirty = False
+        self._mark_dirty()
+        self._moved()
 
     def update_pos(self):
         self.pos = self.pos
 
+    # @function relayout
+    # @abstract Places the object again after the size of its parent changed.
+    # @discussion Objects positioned with set_pos_prop or set_center_prop keep their
+    #             proportional position, all others are only kept inside the parent.
+
+    def relayout(self) -> None:
+        layout = self._layout
+        if layout:
+            getattr(self, layout[0])(layout[1], layout[2])
+        else:
+            self.update_pos()
+
     @property
     def center(self) -> (int, int):
-        return self.rect.center[0] - self._parent.abs_pos[0], self.rect.center[1] - self._parent.abs_pos[1]
+        parent_x, parent_y = self._parent.abs_pos
+        return self.rect.center[0] - parent_x, self.rect.center[1] - parent_y
 
     @center.setter
     def center(self, center: tuple[int, int]):
-        self.rect.center = (center[0] + self._parent.abs_pos[0], center[1] + self._parent.abs_pos[1])
+        self.pos = (center[0] - self.rect.width // 2, center[1] - self.rect.height // 2)
 
     def set_pos_prop(self, x: float, y: float) -> None:
+        self._resolve()
         self.pos = (int((self._parent.size[0] - self.rect.width) * x),
                     int((self._parent.size[1] - self.rect.height) * y))
+        self._layout = ("set_pos_prop", x, y)
 
     # this is a little sus
     def set_center_prop(self, x: float, y: float) -> None:
+        self._resolve()
         self.center = (int((self._parent.size[0] - self.rect.width) * x),
                        int((self._parent.size[1] - self.rect.height) * y))
+        self._layout = ("set_center_prop", x, y)
 
     @property
     def angle(self) -> float:
@@ -143,8 +325,9 @@ class PGObject(pygame.sprite.DirtySprite):
 
     @angle.setter
     def angle(self, angle: float):
-        self._angle = angle
-        self.img = pygame.transform.rotozoom(self._origImage, -self._angle, 1)
+        if angle != self._angle:
+            self._angle = angle
+            self._invalidate_transform()
 
     def normalize_angle(self):
         self._angle %= 360
@@ -158,9 +341,9 @@ class PGObject(pygame.sprite.DirtySprite):
 
     @scale.setter
     def scale(self, factor: float) -> None:
-        self._scale = factor
-        self.img = pygame.transform.smoothscale(self._origImage, (self._origImage.get_width() * factor,
-                                                                  self._origImage.get_height() * factor))
+        if factor != self._scale:
+            self._scale = factor
+            self._invalidate_transform()
 
     def reset_default_scale(self):
         self._scale = 1
@@ -173,88 +356,84 @@ class PGObject(pygame.sprite.DirtySprite):
     def alpha(self, alpha: int) -> None:
         if alpha < 0:
             alpha = 0
-        self.image.set_alpha(alpha)
-        self._origImage.set_alpha(alpha)
-        self._imageSet = True
-        self._alpha = alpha
+        if alpha != self._alpha:
+            self._alpha = alpha
+            self._invalidate_alpha()
 
     def reset_default_alpha(self):
         self._alpha = 255
 
     # Animations
-    # TO-DO: speed customization, unification with delay, inertia
+    # Every animation is a PGTween run by the central animator in wall-clock time.
+    # Calls on the same property are queued and play one after another. Without an
+    # explicit time, rotate, zoom and fade run at the speeds below.
 
-    def move(self, pos: tuple[int, int], time: float = 1) -> None:
-        dx, dy = tuple(map(lambda x, y: (x - y) / (clock.get_fps() * time), pos, self.rect.topleft))
-        dx = math.ceil(dx) if dx > 0 else math.floor(dx)
-        dy = math.ceil(dy) if dy > 0 else math.floor(dy)
-        self._posChanges.append((pos, dx, dy))
+    ROTATE_SPEED = 180
+    ZOOM_SPEED = 12
+    FADE_SPEED = 480
 
-    def _test_move(self) -> None:
-        if not self._posChanges:
-            return
-        if self._posChanges[0][0] == self.pos:
-            self._posChanges.pop(0)
-            return
+    def move(self, pos: tuple[float, float], time: float = 1, easing: Callable = linear) -> None:
+        animator.add(PGTween(self, "pos", tuple(pos), duration=time, easing=easing))
 
-        if self.pos != self._posChanges[0][0]:
-            dx = self._posChanges[0][1]
-            dy = self._posChanges[0][2]
-            x = self._posChanges[0][0][0]
-            y = self._posChanges[0][0][1]
-            temp_x = self.pos[0] + dx
-            temp_y = self.pos[1] + dy
-            if (dx < 0 and temp_x < x) or (dx > 0 and temp_x > x):
-                temp_x = x
-            if (dy < 0 and temp_y < y) or (dy > 0 and temp_y > y):
-                temp_y = y
-            self.pos = (temp_x, temp_y)
-
-    def rotate(self, angle: float) -> None:
-        self._angleChanges.append(angle)
-
-    def _test_rotate(self) -> None:
-        if not self._angleChanges:
-            return
-        if self._angleChanges[0] == self.angle:
-            self._angleChanges.pop(0)
-            self.normalize_angle()
-            return
+    def rotate(self, angle: float, time: float = None, easing: Callable = linear) -> None:
+        animator.add(PGTween(self, "angle", angle, duration=time, speed=self.ROTATE_SPEED, easing=easing,
+                             on_finish=self.normalize_angle))
 
-        if self.angle > self._angleChanges[0]:
-            self.angle = self.angle - 3 if self._angleChanges[0] < self.angle - 3 else self._angleChanges[0]
-        if self.angle < self._angleChanges[0]:
-            self.angle = self.angle + 3 if self._angleChanges[0] > self.angle + 3 else self._angleChanges[0]
+    def zoom(self, factor: float, time: float = None, easing: Callable = linear) -> None:
+        animator.add(PGTween(self, "scale", factor, duration=time, speed=self.ZOOM_SPEED, easing=easing))
 
-    def zoom(self, factor: float):
-        self._scaleChanges.append(factor)
+    def fade(self, alpha: int, time: float = None, easing: Callable = linear) -> None:
+        animator.add(PGTween(self, "alpha", alpha, duration=time, speed=self.FADE_SPEED, easing=easing,
+                             convert=round))
 
-    def _test_zoom(self) -> None:
-        if not self._scaleChanges:
-            return
-        if self._scaleChanges[0] == self.scale:
-            self._scaleChanges.pop(0)
-            return
+    def stop_animations(self) -> None:
+        animator.cancel(self)
 
-        if self.scale > self._scaleChanges[0]:
-            self.scale = self.scale - 0.2 if self._scaleChanges[0] < self.scale - 0.2 else self._scaleChanges[0]
-        elif self.scale < self._scaleChanges[0]:
-            self.scale = self.scale + 0.2 if self._scaleChanges[0] > self.scale + 0.2 else self._scaleChanges[0]
+    def _set_animating(self, animating: bool) -> None:
+        self._animating = animating
+        self._sync_active()
 
-    def fade(self, alpha: int) -> None:
-        self._alphaChanges.append(alpha)
+    # Update scheduling
+    # Groups only call update() on their active objects. Objects are active while they
+    # animate, and objects overriding update() start out awake. Such objects should
+    # sleep() once they have nothing left to do per frame and wake() when they do.
 
-    def _test_fade(self) -> None:
-        if not self._alphaChanges:
-            return
-        if self._alphaChanges[0] == self.alpha:
-            self._alphaChanges.pop(0)
-            return
+    @property
+    def active(self) -> bool:
+        return self._awake or self._animating
+
+    def wake(self) -> None:
+        self._awake = True
+        self._sync_active()
+
+    def sleep(self) -> None:
+        self._awake = False
+        self._sync_active()
 
-        if self.alpha > self._alphaChanges[0]:
-            self.alpha = self.alpha - 8 if self._alphaChanges[0] < self.alpha - 8 else self._alphaChanges[0]
-        elif self.alpha < self._alphaChanges[0]:
-            self.alpha = self.alpha + 8 if self._alphaChanges[0] > self.alpha + 8 else self._alphaChanges[0]
+    def _sync_active(self) -> None:
+        active = self.active
+        for group in self._groups:
+            group.set_active(self, active)
+
+    def kill(self) -> None:
+        animator.cancel(self)
+        super().kill()
+
+    @property
+    def animating(self) -> bool:
+        return animator.is_animating(self)
+
+    # @function culled
+    # @abstract Whether the object lay outside the screen when its scene was last drawn.
+
+    @property
+    def culled(self) -> bool:
+        return self._culled
+
+    def _set_culled(self, culled: bool) -> None:
+        self._culled = culled
+        if not culled:
+            self._mark_dirty()
 
     @property
     def on(self) -> bool:
@@ -286,6 +465,15 @@ class PGObject(pygame.sprite.DirtySprite):
             else:
                 self._hoverOffAction = lambda: action(*args, **kwargs)
 
+    # @function connect_drag
+    # @abstract Calls @action with the pointer position while the object is pressed.
+    # @discussion The object keeps receiving motion events after the pointer leaves it,
+    #             until the button is released.
+
+    def connect_drag(self, action: Callable, *args, **kwargs) -> None:
+        if callable(action):
+            self._dragAction = lambda pos: action(pos, *args, **kwargs)
+
     # TO-DO: double click detection, on click until stops, etc
 
     # @function _on_click
@@ -316,13 +504,22 @@ class PGObject(pygame.sprite.DirtySprite):
             if self._hoverOffAction:
                 self._hoverOffAction()
 
+    # @function pick
+    # @abstract Returns the object that should receive pointer input at @p.
+    # @discussion Objects standing in for others, like cached frame composites,
+    #             return the child under the pointer instead of themselves.
+
+    def pick(self, p: tuple[int, int]) -> "PGObject":
+        return self
+
+    def on_drag(self, pos: tuple[int, int]) -> None:
+        if self._dragAction:
+            self._dragAction(pos)
+
     def collidepoint(self, p: tuple[int, int]) -> bool:
-        mask = from_surface(self.image)
-        try:
-            mask.get_at((p[0] - self.pos[0], p[1] - self.pos[1]))
-            return True
-        except IndexError:
+        if not self.rect.collidepoint(p):
             return False
+        return not self._useMask or bool(self.mask.get_at((p[0] - self.rect.x, p[1] - self.rect.y)))
 
     def update(self, *args, **kwargs) -> None:
         return
@@ -331,45 +528,279 @@ class PGObject(pygame.sprite.DirtySprite):
         return
 
 
+# @function merge_rects
+# @abstract Merges overlapping rects so that every pixel is presented only once.
+
+def merge_rects(rects: Sequence[pygame.Rect]) -> list[pygame.Rect]:
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i > -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+# @class PGGroup
+# @abstract Layered dirty group with pointer dispatch for PGObjects.
+# @discussion update() only visits the objects that are currently active, see
+#             PGObject.wake(), so sleeping objects cost nothing per frame.
+#             Hit-testing goes through a spatial grid over the sprite rects. The grid
+#             is built the first time the group is queried and is then kept up to date
+#             as objects are added, removed, moved or resized, so groups that are never
+#             hit-tested (the per-frame groups mirrored in the draw group) pay nothing.
+#             Objects outside the surface are culled when the group is drawn: they are
+#             neither drawn nor hit-tested until they come back on screen.
+#             Only the topmost object under the pointer is hovered at any time. Pressing
+#             an object captures the pointer: motion and release events then go to that
+#             object directly, without hit-testing, until the button is released.
+
 class PGGroup(pygame.sprite.LayeredDirty):
     def __init__(self, *sprites: Union[PGObject, Sequence[PGObject]]) -> None:
-        super().__init__(*sprites)
+        self._index = None
+        self._order = {}
+        self._nextOrder = 0
+        self._eventSprites = []
+        self._active = {}
         self._currentObj = None
-        self._holding = False
+        self._holding = None
+        self._pending = set()
+        self._culled = set()
+        self._pixelsUpdated = 0
+        self._listener = None
+        self._activeListener = None
+        super().__init__(*sprites)
+
+    # @function pixels_updated
+    # @abstract Number of screen pixels covered by the rects returned by the last draw.
+
+    @property
+    def pixels_updated(self) -> int:
+        return self._pixelsUpdated
+
+    # @function culled_count
+    # @abstract Number of objects skipped by the last draw because they were off screen.
+
+    @property
+    def culled_count(self) -> int:
+        return len(self._culled)
+
+    # @function schedule
+    # @abstract Queues an object whose image must be rebuilt before the next draw.
+
+    def schedule(self, obj: PGObject) -> None:
+        self._pending.add(obj)
+
+    def resolve(self) -> None:
+        while self._pending:
+            self._pending.pop()._resolve()
+
+    # @function listen
+    # @abstract Registers @listener to be called whenever an object of the group changes.
+
+    def listen(self, listener: Callable) -> None:
+        self._listener = listener
+
+    def notify_change(self) -> None:
+        if self._listener:
+            self._listener()
+
+    # @function listen_active
+    # @abstract Registers @listener to be called when the group gains its first active
+    #           object or loses its last one.
+
+    def listen_active(self, listener: Callable) -> None:
+        self._activeListener = listener
+
+    def draw(self, surface: pygame.Surface, bgsurf: pygame.Surface = None, special_flags: int = None) -> list:
+        self.resolve()
+        screen_rect = surface.get_rect()
+        sprites = self._spritelist
+        self._spritelist = self._cull(screen_rect)
+        try:
+            drawn = super().draw(surface, bgsurf, special_flags)
+        finally:
+            self._spritelist = sprites
+        rects = merge_rects(rect.clip(screen_rect) for rect in drawn)
+        self._pixelsUpdated = sum(rect.w * rect.h for rect in rects)
+        return rects
+
+    # Returns the sprites inside @viewport in drawing order and updates the culled
+    # set. Sprites leaving the viewport have their last drawn area repainted with the
+    # background; sprites coming back are redrawn in full.
+
+    def _cull(self, viewport: pygame.Rect) -> list:
+        visible = []
+        culled = set()
+        for s in self._spritelist:
+            if s.rect.colliderect(viewport):
+                visible.append(s)
+            else:
+                culled.add(s)
+        for s in culled - self._culled:
+            old_rect = self.spritedict.get(s)
+            if old_rect:
+                self.lostsprites.append(old_rect)
+            if isinstance(s, PGObject):
+                s._set_culled(True)
+        for s in self._culled - culled:
+            if isinstance(s, PGObject):
+                s._set_culled(False)
+            elif s.dirty == 0:
+                s.dirty = 1
+        self._culled = culled
+        return visible
+
+    def add_internal(self, sprite: PGObject, layer: int = None) -> None:
+        super().add_internal(sprite, layer)
+        self._order[sprite] = self._nextOrder
+        self._nextOrder += 1
+        if isinstance(sprite, PGObject):
+            if type(sprite).process_events is not PGObject.process_events:
+                self._eventSprites.append(sprite)
+        else:
+            self.set_active(sprite, True)
+        if self._index is not None:
+            self._index.insert(sprite, sprite.rect)
+        self.notify_change()
+
+    def remove_internal(self, sprite: PGObject) -> None:
+        super().remove_internal(sprite)
+        self.set_active(sprite, False)
+        self._order.pop(sprite, None)
+        if sprite in self._eventSprites:
+            self._eventSprites.remove(sprite)
+        if sprite is self._currentObj:
+            self._currentObj = None
+        if sprite is self._holding:
+            self._holding = None
+        if sprite in self._culled:
+            self._culled.discard(sprite)
+            if isinstance(sprite, PGObject):
+                sprite._set_culled(False)
+        if self._index is not None:
+            self._index.remove(sprite)
+        self.notify_change()
+
+    def change_layer(self, sprite: PGObject, new_layer: int) -> None:
+        super().change_layer(sprite, new_layer)
+        self._order[sprite] = self._nextOrder
+        self._nextOrder += 1
+
+    def reindex(self, sprite: PGObject) -> None:
+        if self._index is not None:
+            self._index.update(sprite, sprite.rect)
+
+    # @function hit_test
+    # @abstract Returns all visible objects under @p, topmost first, across all layers.
+
+    def hit_test(self, p: tuple[int, int]) -> list[PGObject]:
+        self.resolve()
+        if self._index is None:
+            self._index = PGSpatialGrid()
+            for s in self.sprites():
+                self._index.insert(s, s.rect)
+        hits = [s for s in self._index.query_point(p)
+                if isinstance(s, PGObject) and s.visible and not s.culled and s.collidepoint(p)]
+        hits.sort(key=lambda s: (self.get_layer_of_sprite(s), self._order[s]), reverse=True)
+        return hits
+
+    # @function pick
+    # @abstract Returns the object that receives pointer input at @p, if any.
+
+    def pick(self, p: tuple[int, int]) -> PGObject:
+        for s in self.hit_test(p):
+            target = s.pick(p)
+            if target:
+                return target
+        return None
+
+    # @function hovered
+    # @abstract The topmost object under the pointer, if any.
+
+    @property
+    def hovered(self) -> PGObject:
+        return self._currentObj
+
+    # @function captured
+    # @abstract The object holding the pointer capture, if any.
+
+    @property
+    def captured(self) -> PGObject:
+        return self._holding
+
+    def capture(self, obj: PGObject) -> None:
+        self._holding = obj
+
+    def release(self) -> None:
+        self._holding = None
+
+    def _set_hovered(self, obj: PGObject) -> None:
+        if obj is self._currentObj:
+            return
+        if self._currentObj:
+            self._currentObj.on = False
+            self._currentObj.on_hover(False)
+        self._currentObj = obj
+        if obj:
+            obj.on = True
+            obj.on_hover(True)
 
     def process_events(self, event: pygame.event.Event) -> None:
-        if not self.sprites():
+        if not self._order:
             return
 
-        for s in reversed(self.get_sprites_from_layer(self.get_top_layer())):
-            if not isinstance(s, PGObject):
-                continue
-
-            if event.type == pygame.MOUSEMOTION:
-                if s.collidepoint(event.pos):
-                    if not s.on:
-                        s.on = True
-                        s.on_hover(True)
-                elif s.on:
-                    s.on = False
-                    s.on_hover(False)
-
-            if event.type == pygame.MOUSEBUTTONDOWN and s.collidepoint(event.pos):
-                s.clicked = True
-                s.on_click(False)
+        holder = self._holding
+        if event.type == pygame.MOUSEMOTION:
+            if holder:
+                self._set_hovered(holder if holder.collidepoint(event.pos) else None)
+                holder.on_drag(event.pos)
+                holder.process_events(event)
                 return
-
-            if event.type == pygame.MOUSEBUTTONUP and s.collidepoint(event.pos) and s.clicked:
-                s.clicked = False
-                s.on_click(True)
+            self._set_hovered(self.pick(event.pos))
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            target = self.pick(event.pos)
+            if target:
+                self.capture(target)
+                target.clicked = True
+                target.on_click(False)
+                target.process_events(event)
                 return
 
+        elif event.type == pygame.MOUSEBUTTONUP and holder:
+            self.release()
+            if holder.clicked:
+                holder.clicked = False
+                if holder.collidepoint(event.pos):
+                    holder.on_click(True)
+            holder.process_events(event)
+            return
+
+        self.dispatch(event)
+
+    # @function dispatch
+    # @abstract Passes @event to every object of the group that handles events itself.
+
+    def dispatch(self, event: pygame.event.Event) -> None:
+        for s in self._eventSprites:
             s.process_events(event)
 
+    def set_active(self, sprite: PGObject, active: bool) -> None:
+        was_active = bool(self._active)
+        if not active:
+            self._active.pop(sprite, None)
+        elif sprite in self._order:
+            self._active[sprite] = None
+        if self._activeListener and was_active != bool(self._active):
+            self._activeListener()
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
     def update(self, *args, **kwargs) -> None:
-        super().update(*args, **kwargs)
-        for s in self.sprites():
-            s._test_fade()
-            s._test_rotate()
-            s._test_zoom()
-            s._test_move()
+        for s in list(self._active):
+            s.update(*args, **kwargs)
@@ -27,6 +27,12 @@ from PGLib.PGGame import *
 
 # TO-DO: Add minimize/maximize/close tray
 
+# @class PGPopUpScene
+# @abstract A panel that zooms in over the previous scene.
+# @discussion Widgets of the popup must be created in @self.content, a cached frame
+#             centered on the screen. Opening and closing zoom that frame as a whole,
+#             so both cost one transform per frame however many widgets it holds.
+
 class PGPopUpScene(PGScene):
     def __init__(self, game: PGGame, size: tuple[int, int], img: pygame.Surface = None):
         super().__init__(game, None)
@@ -35,45 +41,53 @@ class PGPopUpScene(PGScene):
             img.fill((0, 0, 0))
         else:
             img = pygame.transform.smoothscale(img, size)
-        self._frameSetup = 0
-        self._frame = PGObject(self, img=img)
-        self._frame.center = pygame.display.get_surface().get_rect().center
-        self._frameSetup = 1
-        self._tempGroup = None
+        self._content = PGFrame(self, size, 0, 0, cached=True)
+        self._content.center = pygame.display.get_surface().get_rect().center
+        self._panel = PGObject(self._content, img=img)
+        self._opening = False
+        self._closing = False
+
+    @property
+    def content(self) -> PGFrame:
+        return self._content
 
-    def add_object(self, obj: PGObject):
-        if self._frameSetup != 0:
-            obj.pos = (self._frame.x + obj.x, self._frame.y + obj.y)
-            if obj.x + obj.rect.width > self._frame.x + self._frame.rect.width:
-                obj.x = self._frame.x + self._frame.rect.width - obj.rect.width
-            if obj.y + obj.rect.height > self._frame.y + self._frame.rect.height:
-                obj.y = self._frame.y + self._frame.rect.height - obj.rect.height
-        self._objects.add(obj)
+    def resize(self, size: tuple[int, int]) -> None:
+        super().resize(size)
+        self._content.center = (size[0] // 2, size[1] // 2)
 
     def activate(self, trans_in: str = "none", trans_out: str = "fade_half") -> None:
-        super().activate("none", "fade_half")
-        self._frame.scale = 0.1
-        self._frame.zoom(1)
+        super().activate("zoom", "fade_half")
 
-    def draw(self) -> None:
-        if self._frameSetup == 1:
-            if not self._tempGroup:
-                self._tempGroup = PGGroup(self._frame)
-            pygame.display.update(self._tempGroup.draw(pygame.display.get_surface()))
-            if self._frame.scale == 1:
-                self._frameSetup = 2
-            return
-        elif self._frameSetup == 2:
-            super().draw()
+    # Closing starts either from finish() or from the game when another scene replaces
+    # the popup. Once closed, the popup opens again the next time it is activated.
+
+    def transition_in(self) -> bool:
+        if not self._opening:
+            self._opening = True
+            self._closing = False
+            self._content.stop_animations()
+            self._content.scale = 0.1
+            self._content.zoom(1)
+        return not self._content.animating
 
     def process_events(self, event: pygame.event.Event) -> None:
-        if self._frameSetup == 2:
+        if not self._closing and not self._content.animating:
             super().process_events(event)
 
     def transition_out(self) -> bool:
-        return self._frame.scale == 0
+        if not self._closing:
+            self._close()
+        if self._content.animating:
+            return False
+        self._opening = False
+        self._closing = False
+        return True
 
     def finish(self, trans_in: str = "fade_half", trans_out: str = "handled_internally") -> None:
-        for s in self._objects.sprites():
-            s.zoom(0)
+        self._close()
         super().finish("fade_half", "handled_internally")
+
+    def _close(self) -> None:
+        self._closing = True
+        self._content.stop_animations()
+        self._content.zoom(0)
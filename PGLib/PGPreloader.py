@@ -0,0 +1,95 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from PGLib.PGGlobal import *
+
+
+# @class PGPreloader
+# @abstract Decodes images on a worker thread ahead of the scenes that use them.
+# @discussion An image is identified by its path and the size it is scaled to. The
+#             worker loads and scales it into a plain RGBA byte buffer, which needs
+#             neither the display nor the GIL for most of the work. The main thread
+#             finalizes a buffer into a display-format surface when the image is
+#             taken, which is a single copy. Images taken before the worker got to
+#             them are decoded on the spot, ones it is working on are waited for.
+#             Each request yields one surface; the preloader does not cache.
+
+class PGPreloader:
+    def __init__(self) -> None:
+        self._executor = None
+        self._jobs = {}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # @function request
+    # @abstract Queues the image at @path, scaled to @size if given, for decoding.
+
+    def request(self, path: str, size: tuple[int, int] = None) -> None:
+        key = (path, tuple(size) if size else None)
+        if key in self._jobs:
+            return
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PGPreloader")
+        self._jobs[key] = self._executor.submit(self.decode, *key)
+
+    def ready(self, path: str, size: tuple[int, int] = None) -> bool:
+        job = self._jobs.get((path, tuple(size) if size else None))
+        return job is None or job.done()
+
+    # @function take
+    # @abstract Returns the image at @path as a display-format surface.
+    # @param alpha Whether the surface keeps per-pixel alpha.
+
+    def take(self, path: str, size: tuple[int, int] = None, alpha: bool = True) -> pygame.Surface:
+        key = (path, tuple(size) if size else None)
+        job = self._jobs.pop(key, None)
+        # A job still waiting in the queue is decoded here rather than after the ones ahead of it
+        if job is None or job.cancel():
+            data, size = self.decode(*key)
+        else:
+            data, size = job.result()
+        surface = pygame.image.frombuffer(data, size, "RGBA")
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    # @function decode
+    # @abstract Loads and scales an image into RGBA bytes; safe to call off the main thread.
+
+    @staticmethod
+    def decode(path: str, size: tuple[int, int] = None) -> tuple[bytes, tuple[int, int]]:
+        surface = pygame.image.load(path)
+        if size and surface.get_size() != size:
+            surface = pygame.image.frombuffer(pygame.image.tobytes(surface, "RGBA"), surface.get_size(), "RGBA")
+            surface = pygame.transform.smoothscale(surface, size)
+        return pygame.image.tobytes(surface, "RGBA"), surface.get_size()
+
+    # @function shutdown
+    # @abstract Drops queued requests and stops the worker once its current image is done.
+
+    def shutdown(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._jobs.clear()
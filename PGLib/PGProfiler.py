@@ -0,0 +1,198 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import csv
+import json
+import time
+
+from pathlib import Path
+from PGLib.PGGlobal import *
+
+
+# @class PGProfiler
+# @abstract Records how long each phase of the game loop takes, frame by frame.
+# @discussion The game loop calls begin_frame(), then mark() after each phase and
+#             end_frame() before it waits for the next frame. The time since the
+#             previous mark is charged to the phase, so the phases of a frame add up to
+#             its total work time, which excludes the wait. The last @capacity frames
+#             are kept in fixed-size ring buffers; percentiles are computed over them.
+#             Frames whose work time exceeds @budget seconds, usually one frame at the
+#             target fps, are counted as dropped. Times are reported in milliseconds.
+#             Frames the game loop skipped while idle are only counted.
+
+class PGProfiler:
+    PHASES = ("events", "process_events", "transition", "update", "draw", "present")
+
+    def __init__(self, capacity: int = 600, budget: float = 1 / 60) -> None:
+        self._capacity = capacity
+        self._budget = budget
+        self._samples = {phase: [0.0] * capacity for phase in self.PHASES + ("frame",)}
+        self._current = dict.fromkeys(self.PHASES, 0.0)
+        self._frames = 0
+        self._dropped = 0
+        self._idle = 0
+        self._frameStart = 0.0
+        self._last = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def budget(self) -> float:
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: float) -> None:
+        self._budget = budget
+
+    # @function frames
+    # @abstract Number of frames recorded since the last reset.
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    # @function dropped
+    # @abstract Number of frames since the last reset that exceeded the budget.
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    # @function idle
+    # @abstract Number of frames since the last reset that were skipped because nothing changed.
+
+    @property
+    def idle(self) -> int:
+        return self._idle
+
+    def idle_frame(self) -> None:
+        self._idle += 1
+
+    def reset(self) -> None:
+        for samples in self._samples.values():
+            samples[:] = [0.0] * self._capacity
+        self._frames = 0
+        self._dropped = 0
+        self._idle = 0
+
+    def begin_frame(self) -> None:
+        self._frameStart = self._last = time.perf_counter()
+        for phase in self._current:
+            self._current[phase] = 0.0
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        i = self._frames % self._capacity
+        for phase, duration in self._current.items():
+            self._samples[phase][i] = duration
+        total = self._last - self._frameStart
+        self._samples["frame"][i] = total
+        if total > self._budget:
+            self._dropped += 1
+        self._frames += 1
+
+    # @function samples
+    # @abstract The recorded durations of @phase in seconds, oldest first.
+    # @param phase One of @PHASES, or "frame" for the total work time.
+
+    def samples(self, phase: str = "frame") -> list[float]:
+        samples = self._samples[phase]
+        if self._frames < self._capacity:
+            return samples[:self._frames]
+        i = self._frames % self._capacity
+        return samples[i:] + samples[:i]
+
+    # @function percentile
+    # @abstract The nearest-rank @p-th percentile of @phase over the kept frames, in ms.
+
+    def percentile(self, phase: str, p: float) -> float:
+        samples = sorted(self.samples(phase))
+        if not samples:
+            return 0.0
+        rank = max(0, min(len(samples) - 1, round(p / 100 * len(samples)) - 1))
+        return samples[rank] * 1000
+
+    def summary(self) -> dict:
+        phases = {}
+        for phase in self.PHASES + ("frame",):
+            samples = self.samples(phase)
+            phases[phase] = {
+                "mean": sum(samples) / len(samples) * 1000 if samples else 0.0,
+                "p50": self.percentile(phase, 50),
+                "p95": self.percentile(phase, 95),
+                "p99": self.percentile(phase, 99),
+                "max": max(samples) * 1000 if samples else 0.0,
+            }
+        return {"frames": self._frames, "dropped": self._dropped, "idle": self._idle,
+                "budget": self._budget * 1000, "phases": phases}
+
+    # @function export
+    # @abstract Writes the kept frames to @path as CSV or, for a .json path, as JSON.
+    # @discussion CSV holds one row per frame and one column per phase. JSON holds the
+    #             summary and the per-frame samples.
+
+    def export(self, path: str) -> None:
+        if Path(path).suffix.lower() == ".json":
+            self.export_json(path)
+        else:
+            self.export_csv(path)
+
+    def export_csv(self, path: str) -> None:
+        columns = self.PHASES + ("frame",)
+        rows = zip(*(self.samples(phase) for phase in columns))
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(column + "_ms" for column in columns)
+            for row in rows:
+                writer.writerow(f"{duration * 1000:.3f}" for duration in row)
+
+    def export_json(self, path: str) -> None:
+        data = self.summary()
+        data["samples"] = {phase: [round(duration * 1000, 3) for duration in self.samples(phase)]
+                           for phase in self.PHASES + ("frame",)}
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    # @function render_hud
+    # @abstract Renders the current statistics as a small translucent panel.
+
+    def render_hud(self, font: pygame.font.Font) -> pygame.Surface:
+        lines = [f"frame  p50 {self.percentile('frame', 50):5.2f}  p95 {self.percentile('frame', 95):5.2f}"
+                 f"  p99 {self.percentile('frame', 99):5.2f} ms",
+                 f"dropped {self._dropped} / {self._frames}  idle {self._idle}"]
+        lines += [f"{phase:<15}p95 {self.percentile(phase, 95):5.2f} ms" for phase in self.PHASES]
+        images = [font.render(line, True, (255, 255, 255)) for line in lines]
+        height = font.get_linesize()
+        hud = pygame.Surface((max(image.get_width() for image in images) + 8, height * len(images) + 8),
+                             pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 180))
+        for i, image in enumerate(images):
+            hud.blit(image, (4, 4 + i * height))
+        return hud
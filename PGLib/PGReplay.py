@@ -0,0 +1,160 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import json
+
+from PGLib.PGGlobal import *
+
+
+# Recordings
+# A recording holds the input events the game loop consumed, each tagged with the
+# index of the frame it arrived in, and the length of every frame. Replaying feeds
+# the events back in the same frames and advances the game clock by the recorded
+# frame lengths, so the game goes through the same states as when it was recorded,
+# at full speed. Only input events are kept; window and system events would not
+# reproduce anything. The file is gzip-compressed JSON.
+
+RECORDED_EVENTS = (pygame.QUIT, pygame.VIDEORESIZE, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+                   pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL)
+
+RECORDING_VERSION = 1
+
+
+# @class PGEventRecorder
+# @abstract Collects the events and frame times of a running game.
+
+class PGEventRecorder:
+    def __init__(self, fps: int, size: tuple[int, int]) -> None:
+        self._fps = fps
+        self._size = tuple(size)
+        self._events = []
+        self._frameTimes = []
+
+    @property
+    def frames(self) -> int:
+        return len(self._frameTimes)
+
+    # @function begin_frame
+    # @abstract Starts the next frame with the @events the game loop is about to handle.
+
+    def begin_frame(self, events: list[pygame.event.Event]) -> None:
+        frame = len(self._frameTimes)
+        self._frameTimes.append(0)
+        for event in events:
+            if event.type in RECORDED_EVENTS:
+                self._events.append([frame, event.type, self._attributes(event)])
+
+    # @function end_frame
+    # @abstract Records the @dt seconds the game clock advanced by after the current frame.
+
+    def end_frame(self, dt: float) -> None:
+        self._frameTimes[-1] = round(dt * 1e6)
+
+    # Only plain values survive; the window an event belongs to, for example, does not.
+
+    @staticmethod
+    def _attributes(event: pygame.event.Event) -> dict:
+        attributes = {}
+        for key, value in event.dict.items():
+            if isinstance(value, (int, float, str)):
+                attributes[key] = value
+            elif isinstance(value, (tuple, list)) and all(isinstance(v, (int, float)) for v in value):
+                attributes[key] = list(value)
+        return attributes
+
+    def save(self, path: str) -> None:
+        data = {"version": RECORDING_VERSION, "fps": self._fps, "size": self._size,
+                "frame_times_us": self._frameTimes, "events": self._events}
+        with gzip.open(path, "wt") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+
+# @class PGEventReplay
+# @abstract A loaded recording, read back frame by frame.
+
+class PGEventReplay:
+    def __init__(self, path: str) -> None:
+        with gzip.open(path, "rt") as file:
+            data = json.load(file)
+        assert data["version"] == RECORDING_VERSION, "Unsupported recording version!"
+        self._fps = data["fps"]
+        self._size = tuple(data["size"])
+        self._frameTimes = [us / 1e6 for us in data["frame_times_us"]]
+        self._events = {}
+        for frame, event_type, attributes in data["events"]:
+            attributes = {key: tuple(value) if isinstance(value, list) else value
+                          for key, value in attributes.items()}
+            self._events.setdefault(frame, []).append(pygame.event.Event(event_type, attributes))
+
+    @property
+    def fps(self) -> int:
+        return self._fps
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    @property
+    def frames(self) -> int:
+        return len(self._frameTimes)
+
+    def events(self, frame: int) -> list[pygame.event.Event]:
+        return self._events.get(frame, [])
+
+    # Frames past the end of the recording last one frame at the recorded fps.
+
+    def frame_time(self, frame: int) -> float:
+        if frame < len(self._frameTimes):
+            return self._frameTimes[frame]
+        return 1 / self._fps
+
+
+# @function compare_reports
+# @abstract Differences between two timing reports written by PGProfiler.export_json.
+# @return For every phase and statistic, the value before, after and the change in percent.
+
+def compare_reports(before: str, after: str) -> dict:
+    with open(before) as file:
+        old = json.load(file)
+    with open(after) as file:
+        new = json.load(file)
+    result = {}
+    for phase, stats in new["phases"].items():
+        result[phase] = {}
+        for stat, value in stats.items():
+            base = old["phases"].get(phase, {}).get(stat, 0.0)
+            change = (value - base) / base * 100 if base else 0.0
+            result[phase][stat] = (base, value, change)
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    assert len(sys.argv) == 3, "Usage: python -m PGLib.PGReplay before.json after.json"
+    for phase, stats in compare_reports(sys.argv[1], sys.argv[2]).items():
+        print(phase)
+        for stat, (base, value, change) in stats.items():
+            print(f"  {stat:<5}{base:9.3f} ->{value:9.3f} ms  {change:+7.1f}%")
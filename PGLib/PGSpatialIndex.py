@@ -0,0 +1,124 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import pygame
+
+from typing import Any, Iterable
+
+
+# @class PGSpatialGrid
+# @abstract Uniform grid over screen rects for point and area queries.
+# @discussion Every entry is stored in all cells its rect overlaps, so a point query
+#             only looks at the objects sharing one cell with it. Entries covering
+#             more than @MAX_CELLS cells (full-screen veils, backgrounds) are kept in a
+#             separate list that every query checks, which keeps updates of large
+#             objects cheap. Queries return candidates whose rect contains the point
+#             or overlaps the area; finer tests are left to the caller.
+
+class PGSpatialGrid:
+    MAX_CELLS = 64
+
+    def __init__(self, cell_size: int = 64) -> None:
+        self._cellSize = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._large = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, obj: Any) -> bool:
+        return obj in self._entries
+
+    def _cell_range(self, rect: pygame.Rect) -> tuple[int, int, int, int]:
+        size = self._cellSize
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size if rect.w else rect.left // size,
+                (rect.bottom - 1) // size if rect.h else rect.top // size)
+
+    def insert(self, obj: Any, rect: pygame.Rect) -> None:
+        if obj in self._entries:
+            self.update(obj, rect)
+            return
+        cells = self._cell_range(rect)
+        self._entries[obj] = (pygame.Rect(rect), cells)
+        self._link(obj, cells)
+
+    def update(self, obj: Any, rect: pygame.Rect) -> None:
+        entry = self._entries.get(obj)
+        if entry is None:
+            self.insert(obj, rect)
+            return
+        cells = self._cell_range(rect)
+        if cells != entry[1]:
+            self._unlink(obj, entry[1])
+            self._link(obj, cells)
+        self._entries[obj] = (pygame.Rect(rect), cells)
+
+    def remove(self, obj: Any) -> None:
+        entry = self._entries.pop(obj, None)
+        if entry is not None:
+            self._unlink(obj, entry[1])
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entries.clear()
+        self._large.clear()
+
+    def query_point(self, p: tuple[int, int]) -> list:
+        size = self._cellSize
+        found = [obj for obj in self._cells.get((p[0] // size, p[1] // size), ())
+                 if self._entries[obj][0].collidepoint(p)]
+        found.extend(obj for obj in self._large if self._entries[obj][0].collidepoint(p))
+        return found
+
+    def query_rect(self, rect: pygame.Rect) -> set:
+        x0, y0, x1, y1 = self._cell_range(rect)
+        found = set()
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                found.update(self._cells.get((x, y), ()))
+        found.update(self._large)
+        return {obj for obj in found if self._entries[obj][0].colliderect(rect)}
+
+    def _link(self, obj: Any, cells: tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.MAX_CELLS:
+            self._large.add(obj)
+            return
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self._cells.setdefault((x, y), set()).add(obj)
+
+    def _unlink(self, obj: Any, cells: tuple[int, int, int, int]) -> None:
+        if obj in self._large:
+            self._large.discard(obj)
+            return
+        x0, y0, x1, y1 = cells
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = self._cells[(x, y)]
+                cell.discard(obj)
+                if not cell:
+                    del self._cells[(x, y)]
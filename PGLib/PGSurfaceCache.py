@@ -0,0 +1,107 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from collections import OrderedDict
+from PGLib.PGGlobal import *
+
+
+# @class PGSurfaceCache
+# @abstract Bounded LRU store of surfaces shared by the surface caches of PGLib.
+# @discussion Keys are tuples whose first element names the source an entry was made
+#             from, and discard() drops every entry of one source through an index of
+#             the keys per source. Cached surfaces are shared and must be treated as
+#             read-only. Entries are evicted least recently used first once @budget
+#             bytes are exceeded.
+
+class PGSurfaceCache:
+    def __init__(self, budget: int) -> None:
+        self._entries = OrderedDict()
+        self._sources = {}
+        self._budget = budget
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: int) -> None:
+        self._budget = budget
+        self._evict()
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def _lookup(self, key: tuple) -> pygame.Surface:
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return surface
+
+    def _store(self, key: tuple, surface: pygame.Surface) -> pygame.Surface:
+        self._entries[key] = surface
+        self._sources.setdefault(key[0], set()).add(key)
+        self._bytes += self.surface_bytes(surface)
+        self._evict()
+        return surface
+
+    # @function discard
+    # @abstract Drops every cached entry made from @source.
+
+    def discard(self, source) -> None:
+        for key in self._sources.pop(source, ()):
+            self._bytes -= self.surface_bytes(self._entries.pop(key))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sources.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._bytes, "budget": self._budget,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and self._entries:
+            key, surface = self._entries.popitem(last=False)
+            keys = self._sources[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self._sources[key[0]]
+            self._bytes -= self.surface_bytes(surface)
+            self.evictions += 1
@@ -0,0 +1,85 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from PGLib.PGGlobal import *
+
+
+# @class PGSurfacePool
+# @abstract Keeps full-screen working surfaces alive for reuse.
+# @discussion Surfaces are keyed by a name and the resolution, so every purpose gets
+#             one surface per screen size, allocated the first time it is asked for.
+#             Filled surfaces, like the black veil of fades, are filled once; snapshots
+#             are overwritten in place with the pixels of their source.
+
+class PGSurfacePool:
+    def __init__(self) -> None:
+        self._surfaces = {}
+        self._allocations = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    # @function allocations
+    # @abstract Number of surfaces the pool has created so far.
+
+    @property
+    def allocations(self) -> int:
+        return self._allocations
+
+    def get(self, name: str, size: tuple[int, int], alpha: bool = True) -> pygame.Surface:
+        key = (name, tuple(size), alpha)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if alpha:
+                surface = pygame.Surface(size, pygame.SRCALPHA)
+            else:
+                surface = pygame.Surface(size, 0, pygame.display.get_surface())
+            self._surfaces[key] = surface
+            self._allocations += 1
+        return surface
+
+    def filled(self, size: tuple[int, int], color: tuple) -> pygame.Surface:
+        key = ("filled", tuple(size), tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(color)
+            self._allocations += 1
+        return surface
+
+    # @function snapshot
+    # @abstract Copies @source into the pooled surface @name of the same size.
+    # @param alpha Whether the snapshot has per-pixel alpha, which PGObjects need to
+    #              use it as their image without a conversion.
+
+    def snapshot(self, name: str, source: pygame.Surface, alpha: bool = False) -> pygame.Surface:
+        surface = self.get(name, source.get_size(), alpha)
+        surface.blit(source, (0, 0))
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+
+surface_pool = PGSurfacePool()
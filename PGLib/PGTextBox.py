@@ -24,6 +24,7 @@
 
 import pygame
 import pygame.locals as pl
+from PGLib.PGFonts import font_registry
 
 pygame.font.init()
 
@@ -153,7 +154,7 @@ class TextInputVisualizer:
                  ):
 
         self._manager = TextInputManager() if manager is None else manager
-        self._font_object = pygame.font.Font(pygame.font.get_default_font(), 25) if font_object is None else font_object
+        self._font_object = font_registry.font(pygame.font.get_default_font(), 25) if font_object is None else font_object
         self._antialias = antialias
         self._font_color = font_color
 
@@ -0,0 +1,82 @@
+#
+# MIT License
+#
+# Copyright (c) 2022 cjiang. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from PGLib.PGGlobal import *
+from PGLib.PGSurfaceCache import PGSurfaceCache
+
+
+# @class PGTransformCache
+# @abstract Bounded LRU cache of rotated and scaled surfaces.
+# @discussion Results are keyed by the source surface, the angle quantized to
+#             @ANGLE_STEP degrees and the scale quantized to @SCALE_STEP, so that
+#             replaying the same rotate/zoom animation reuses earlier results
+#             instead of running rotozoom/smoothscale again. Cached surfaces are
+#             shared between objects and must be treated as read-only; callers
+#             that need their own alpha should take a subsurface view. discard(src)
+#             must be called when the pixels of @src are modified in place.
+
+class PGTransformCache(PGSurfaceCache):
+    ANGLE_STEP = 0.5
+    SCALE_STEP = 0.01
+
+    def __init__(self, budget: int = 32 * 1024 * 1024) -> None:
+        super().__init__(budget)
+
+    # @function transform
+    # @abstract Returns @src rotated clockwise by @angle degrees and scaled by @scale.
+    # @discussion Unrotated transforms use smoothscale, everything else rotozoom,
+    #             matching what PGObject did before the cache existed.
+
+    def transform(self, src: pygame.Surface, angle: float = 0, scale: float = 1) -> pygame.Surface:
+        angle = round((angle % 360) / self.ANGLE_STEP) * self.ANGLE_STEP % 360
+        scale = round(scale / self.SCALE_STEP) * self.SCALE_STEP
+        key = (src, angle, scale)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface
+
+        if angle == 0:
+            surface = pygame.transform.smoothscale(src, (max(0, round(src.get_width() * scale)),
+                                                         max(0, round(src.get_height() * scale))))
+        else:
+            surface = pygame.transform.rotozoom(src, -angle, scale)
+        return self._store(key, surface)
+
+    # @function resize
+    # @abstract Returns @src smoothscaled to exactly @size.
+    # @discussion Meant for layouts that fit images to the screen, so that switching
+    #             back and forth between window sizes reuses earlier results.
+
+    def resize(self, src: pygame.Surface, size: tuple[int, int]) -> pygame.Surface:
+        size = (max(0, round(size[0])), max(0, round(size[1])))
+        if size == src.get_size():
+            return src
+        key = (src, None, size)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface
+        return self._store(key, pygame.transform.smoothscale(src, size))
+
+
+transform_cache = PGTransformCache()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(DIRECTORY), DIRECTORY]
+
+from PGLib.PGGame import *
+from PGLib.PGBundle import build_bundle
+from SRMainScene import SRGame, SRMainScene
+from SRLevelSelectionScene import SRLevelSelectionScene
+import glob
+
+
+# Writes the asset bundle loaded by SRGame. Paths are resolved against this
+# directory, like the game resolves them, so it can be run from anywhere:
+#   python SRGame/SRBundle.py
+
+SCENES = (SRMainScene, SRLevelSelectionScene)
+
+
+def build(output: str = SRGame.BUNDLE) -> None:
+    pygame.mixer.init()
+    assets = dict.fromkeys(asset for scene in SCENES for asset in scene.ASSETS)
+    images = [(os.path.join(DIRECTORY, path), size) for path, size in assets]
+    sounds = sorted(glob.glob(os.path.join(DIRECTORY, '../Assets/*.wav')))
+    output = os.path.normpath(os.path.join(DIRECTORY, output))
+    build_bundle(output, images, sounds)
+    print(output, len(images), "images", len(sounds), "sounds")
+
+
+if __name__ == "__main__":
+    build()
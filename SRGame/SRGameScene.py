@@ -21,6 +21,22 @@ class Whiteboard(PGFrame):
         pygame.draw.rect(bg, "white", pygame.Rect(0, 0, self.size[0], self.size[1]))
         self._bg = PGObject(self, 0, 0, bg)
         self._anal_ = __Whiteboard__(self.size[0], self.size[1], 8)
+        self._last = None
+        self._bg.connect_click(self.begin_stroke, False)
+        self._bg.connect_drag(self.draw_stroke)
+
+    def begin_stroke(self):
+        self._last = None
+
+    def draw_stroke(self, pos):
+        x, y = pos[0] - self._bg.rect.x, pos[1] - self._bg.rect.y
+        if not (0 <= x < self.size[0] and 0 <= y < self.size[1]):
+            return
+        if self._last:
+            pygame.draw.line(self._bg.img, "black", self._last, (x, y), 3)
+            self._bg.refresh_image()
+        self._anal_.add_point(x, y)
+        self._last = (x, y)
 
 
 
@@ -5,4 +5,4 @@ class SRHelpScene(PGPopUpScene):
     def __init__(self, game: PGGame):
         bg = pygame.Surface(game.screen.get_size(), pygame.SRCALPHA)
         bg.fill((50, 50, 100))
-        super().__init__(game, bg)
+        super().__init__(game, (bg.get_width() * 2 // 3, bg.get_height() * 2 // 3), bg)
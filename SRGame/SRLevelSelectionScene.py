@@ -29,7 +29,7 @@ def _circlepoints(r):
     return points
 
 def render(text, gfcolor=pygame.Color('dodgerblue'), ocolor=(255, 255, 255), opx=2):
-    font = pygame.font.SysFont(None, 64)
+    font = font_registry.font(None, 64)
     textsurface = font.render(text, True, gfcolor).convert_alpha()
     w = textsurface.get_width() + 2 * opx
     h = font.get_height()
@@ -49,17 +49,13 @@ def render(text, gfcolor=pygame.Color('dodgerblue'), ocolor=(255, 255, 255), opx
 
 
 class SRLevelButton(PGFrame):
-    def __init__(self, parent, x: int = 0, y: int = 0, level: int = 1):
+    def __init__(self, parent, star_empty: pygame.Surface, x: int = 0, y: int = 0, level: int = 1):
         radius = 40
-        super().__init__(parent, (radius * 2, 105), x, y)
+        super().__init__(parent, (radius * 2, 105), x, y, cached=True)
         circle = pygame.Surface((radius * 2, radius * 2))
         pygame.draw.circle(circle, "blue", (radius, radius), radius)
         self._circle = PGObject(self, 0, 0, circle)
 
-        star_filled = pygame.image.load('../Assets/Icons/star.png').convert_alpha()
-        star_empty = star_filled.copy()
-        color_surface(star_empty, 120, 78, 240)
-        star_empty = pygame.transform.smoothscale(star_empty, (20, 20))
         for i in range(3):
             obj = PGObject(self, 0, 0, star_empty)
             obj.pos = (5 + i * 25, 85)
@@ -70,19 +66,24 @@ class SRLevelButton(PGFrame):
 
 
 class SRLevelSelectionScene(PGScene):
+    ASSETS = (('../Assets/Icons/star.png', (20, 20)),)
+
     def __init__(self, game: PGGame):
         bg = pygame.Surface(game.screen.get_size(), pygame.SRCALPHA)
         bg.fill((50, 50, 100))
         super().__init__(game, bg)
         self._buttons = []
 
+        star_empty = self.load_image('../Assets/Icons/star.png', (20, 20), 'empty',
+                                     lambda star: color_surface(star, 120, 78, 240))
+
         for i in range(15):
             x = 10 + i * 120
             y = 0
             while x > self._screen.get_width():
                 x -= self._screen.get_width()
                 y += 130
-            self._buttons.append(SRLevelButton(self, x, y, i + 1))
+            self._buttons.append(SRLevelButton(self, star_empty, x, y, i + 1))
 
         self._buttons[0].connect_click(self.hi)
 
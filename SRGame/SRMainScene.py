@@ -3,43 +3,68 @@ from SRHelpScene import SRHelpScene
 from SRLevelSelectionScene import SRLevelSelectionScene
 from SRShopScene import SRShopScene
 from SRGameScene import SRGameScene
+import os
 import sys
 import numpy as np
 from pathlib import Path
 
 
 class SRGame(PGGame):
-    def __init__(self, fps: int = 60):
-        super().__init__(fps)
+    ICON_ATLAS = '../Assets/icons_atlas.json'
+    BUNDLE = '../Assets/assets.bundle'
+
+    def __init__(self, fps: int = 60, headless: bool = False):
+        super().__init__(fps, dirty_rects=True, headless=headless)
 
         pygame.display.set_caption("Ride With Physics")
 
-        font_path = '../Assets/BH.ttf'
-        self.font = pygame.font.Font(font_path, 52)
-        self.font_l = pygame.font.Font(font_path, 74)
-        self.font_s = pygame.font.Font(font_path, 38)
-        self.font_ss = pygame.font.Font(font_path, 20)
+        font_registry.register('BH', '../Assets/BH.ttf', (20, 38, 52, 74))
+        font_registry.register('pen', '../Assets/pen_font.ttf')
+        self.font = font_registry.font('BH', 52)
+        self.font_l = font_registry.font('BH', 74)
+        self.font_s = font_registry.font('BH', 38)
+        self.font_ss = font_registry.font('BH', 20)
+
+        # Built by SRBundle.py and python -m PGLib.PGAtlas Assets/Icons Assets/icons_atlas
+        if os.path.exists(self.BUNDLE):
+            asset_manager.add_bundle(PGBundle(self.BUNDLE))
+        if os.path.exists(self.ICON_ATLAS):
+            asset_manager.add_atlas(PGAtlas(self.ICON_ATLAS))
 
         file = Path('high_score.npy')
         file.touch(exist_ok=True)
         try:
             high_score = np.load('high_score.npy')[0]
-        except ValueError:
+        except (ValueError, EOFError):
             high_score = 0
 
-    def get_icon(self, name: str):
-        return pygame.image.load('../Assets/Icons/' + name + '.png')
+    @staticmethod
+    def icon_path(name: str) -> str:
+        return '../Assets/Icons/' + name + '.png'
+
+    def get_icon(self, name: str, size: tuple[int, int] = None):
+        return asset_manager.image(self.icon_path(name), size)
 
 
 class SRImageButton(PGObject):
     def __init__(self, parent, x: float, y: float, sz: int, name: str):
-        img = parent.game.get_icon(name)
-        img = pygame.transform.scale(img, (sz, sz))
-        super().__init__(parent, 0, 0, img)
+        self._iconName = name
+        self._iconSize = sz
+        super().__init__(parent, 0, 0, self._scaled_icon(parent.scene))
         self.set_pos_prop(x, y)
         self.connect_hover(True, self.lighten)
         self.connect_hover(False, self.darken)
 
+    # Icon sizes are given for the design size of the game and follow the window.
+
+    def _scaled_icon(self, scene: PGScene) -> pygame.Surface:
+        sz = max(1, round(self._iconSize * scene.layout_scale))
+        return scene.game.get_icon(self._iconName, (sz, sz))
+
+    def relayout(self):
+        self.img = self._scaled_icon(self._parent.scene)
+        super().relayout()
+
     def lighten(self):
         self.alpha = 150
 
@@ -48,15 +73,18 @@ class SRImageButton(PGObject):
 
 
 class SRMainScene(PGScene):
+    ASSETS = (('../Assets/notebook.jpg', None), (SRGame.icon_path('menu_car'), (732, 420)),
+              (SRGame.icon_path('play'), (150, 150))) + \
+        tuple((SRGame.icon_path(name), (70, 70)) for name in ('quit', 'sound', 'help', 'shop'))
+
     def __init__(self, game: SRGame):
         bg = pygame.Surface(game.screen.get_size(), pygame.SRCALPHA)
         w, h = game.screen.get_size()
-        im = pygame.image.load('../Assets/notebook.jpg')
+        im = asset_manager.image('../Assets/notebook.jpg', alpha=False)
         bg.blit(im, (-20, -20))
         super().__init__(game, bg)
 
-        car = game.get_icon("menu_car")
-        car = pygame.transform.scale(car, (732, 420))
+        car = game.get_icon("menu_car", (732, 420))
         car_cropped = pygame.Surface((432, 370))
         car_cropped.blit(car, (-300, 0))
         self._car = PGObject(self, 0, 95, car_cropped)
@@ -82,26 +110,29 @@ class SRMainScene(PGScene):
         self._button4.connect_click(self.go_help)
         self._button5.connect_click(self.go_shop)
 
+        game.preload(SRLevelSelectionScene)
+
     def debug(self):
-        SRGameScene(self.game).activate()
+        self.game.push_scene(SRGameScene)
 
     def start(self):
-        SRLevelSelectionScene(self.game).activate()
+        self.game.push_scene(SRLevelSelectionScene)
 
     def quit(self):
-        pygame.quit()
+        self.game.quit()
         sys.exit()
 
     def sound(self):
         pass
 
     def go_help(self):
-        SRHelpScene(self.game).activate()
+        self.game.push_scene(SRHelpScene, "zoom", "fade_half")
 
     def go_shop(self):
-        SRShopScene(self.game).activate()
+        self.game.push_scene(SRShopScene)
 
 
-game = SRGame()
-SRMainScene(game).activate(trans_in="fade")
-game.start()
+if __name__ == "__main__":
+    game = SRGame()
+    SRMainScene(game).activate(trans_in="fade")
+    game.start()
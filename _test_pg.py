@@ -39,11 +39,11 @@ class Scene2(PGPopUpScene):
         img = pygame.Surface((600, 425))
         img.fill((100, 200, 150))
         super().__init__(game, (600, 425), img)
-        self._button1 = PGTextButton(self, 550, 1000, "googoo")
+        self._button1 = PGTextButton(self.content, 550, 1000, "googoo")
         self._button1.connect_click(self.finish)
 
-    def update(self) -> None:
-        super().update()
+    def update(self, dt: float) -> None:
+        super().update(dt)
 
 
 game = PGGame()
@@ -6,6 +6,8 @@ from os import chdir
 from matplotlib import pyplot as plt
 from math import atan, degrees
 import webbrowser
+from PGLib.PGAssets import asset_manager
+from PGLib.PGBundle import PGBundle
 
 # global variables
 screen_width = 720
@@ -197,6 +199,8 @@ class Icon(pygame.sprite.Sprite):
 
 
 class Collideable(pygame.sprite.Sprite):
+    FADE_SPEED = 300  # alpha per second
+
     def __init__(self, x, y, w, h, sprite):
         """
         :param x: x cord
@@ -218,15 +222,14 @@ class Collideable(pygame.sprite.Sprite):
     def mask(self):
         return pygame.mask.from_surface(self.sprite)
 
-    def pop(self):
+    def pop(self, dt):
         """
         Disappear object.
+        :param dt: seconds since the last frame
         """
         alpha = self.sprite.get_alpha()
-        if alpha > 5:
-            self.sprite.set_alpha(alpha-5)
-        elif alpha != 0:
-            self.sprite.set_alpha(0)
+        if alpha != 0:
+            self.sprite.set_alpha(max(0, round(alpha - self.FADE_SPEED * dt)))
 
     def clear(self):
         """
@@ -236,26 +239,30 @@ class Collideable(pygame.sprite.Sprite):
 
 
 class Car(Collideable):
+    SPEED = 60  # path samples per second
+
     def __init__(self, x, y, w, h, sprite):
         super(Car, self).__init__(x-w/2+20, y-h/2, w, h, sprite)
         self.step = 0
         self.sprite_i = self.sprite
         self.x_i, self.y_i = x-w/2+20, y-h/2
 
-    def update(self, arrived_2):
+    def update(self, arrived_2, dt):
         """
         Drive over the line.
         :param arrived_2: Coordinate points to walk through
+        :param dt: seconds since the last frame
         """
-        self.x, self.y = arrived_2[self.step]
-        slope = arrived_2[self.step + 1][1]-self.y
+        step = int(self.step)
+        self.x, self.y = arrived_2[step]
+        slope = arrived_2[step + 1][1]-self.y
         ang = degrees(atan(slope)) # calculate angle to drive
         self.sprite = pygame.transform.rotate(self.sprite_i, -ang) # rotate
         self.w, self.h = self.sprite.get_size()
         self.x -= self.w/2  # correct for misalignment
         self.y -= self.h/2
         if self.step < len(arrived_2)-2:
-            self.step += 1
+            self.step = min(self.step + self.SPEED * dt, len(arrived_2)-2)
             return True
         else:
             return False
@@ -294,23 +301,23 @@ def game_start():
 
     high_score = np.load('high_score.npy')[0]
 
-    box = pygame.image.load('Assets/frame.png')
-    back = pygame.image.load('Assets/notebook.jpg')
-    play = pygame.image.load('Assets/play.png')
-    erase = pygame.image.load('Assets/erase.png')
-    line = pygame.image.load('Assets/line.png')
-    star = pygame.image.load('Assets/star.png')
-    flag_i = pygame.image.load('Assets/finishflag.png')
-    car_t  = pygame.image.load('Assets/car.png') if high_score < 100 else pygame.image.load('Assets/car_g.png')
-    exit_i = pygame.image.load('Assets/exit.png')
+    box = asset_manager.image('Assets/frame.png')
+    back = asset_manager.image('Assets/notebook.jpg', alpha=False)
+    play = asset_manager.image('Assets/play.png')
+    erase = asset_manager.image('Assets/erase.png')
+    line = asset_manager.image('Assets/line.png')
+    star = asset_manager.image('Assets/star.png')
+    flag_i = asset_manager.image('Assets/finishflag.png')
+    car_t  = asset_manager.image('Assets/car.png') if high_score < 100 else asset_manager.image('Assets/car_g.png')
+    exit_i = asset_manager.image('Assets/exit.png')
 
     # load sound assets
 
-    click        = pygame.mixer.Sound('Assets/click.wav')
-    collect_star = pygame.mixer.Sound('Assets/collect_star.wav')
-    collect_flag = pygame.mixer.Sound('Assets/collect_flag.wav')
-    car_go       = pygame.mixer.Sound('Assets/car_sound.wav')
-    lose         = pygame.mixer.Sound('Assets/cat.wav')
+    click        = asset_manager.sound('Assets/click.wav')
+    collect_star = asset_manager.sound('Assets/collect_star.wav')
+    collect_flag = asset_manager.sound('Assets/collect_flag.wav')
+    car_go       = asset_manager.sound('Assets/car_sound.wav')
+    lose         = asset_manager.sound('Assets/cat.wav')
 
     wb1    = Whiteboard(20, 20, 320, 340, 7, box, line)
     wb2    = Whiteboard(380, 20, 320, 340, 7, box, line)
@@ -353,11 +360,10 @@ def game_start():
 
     '''----------------------------------LOOP-------------------------------'''
 
-    main_help_spr = pygame.image.load('Assets/help.png')
-    main_quit_spr = pygame.image.load('Assets/off.png')
-    menu_car      = pygame.image.load('Assets/menu_car.png') if high_score < 100 \
-        else pygame.image.load('Assets/menu_car_g.png')
-    menu_car      = pygame.transform.scale(menu_car, (732, 420))
+    main_help_spr = asset_manager.image('Assets/help.png')
+    main_quit_spr = asset_manager.image('Assets/off.png')
+    menu_car      = asset_manager.image('Assets/menu_car.png', (732, 420)) if high_score < 100 \
+        else asset_manager.image('Assets/menu_car_g.png', (732, 420))
     main_start = Icon(w/2 + 130, h / 2 - 70, 140, 140, play)
     main_help = Icon(420, 340, 140, 140, main_help_spr)
     main_quit = Icon(550, 350, 120, 120, main_quit_spr)
@@ -418,6 +424,7 @@ def game_start():
         clock.tick(60)
 
     # game menu
+    dt = 0
     while True:
         # Handling events
         mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -525,7 +532,7 @@ def game_start():
 
         # Updating Sprites
         if start:
-            if not car.update(arrived_2): # drive the car
+            if not car.update(arrived_2, dt): # drive the car
                 if flag_received:
                     streak += star_1_received + star_2_received + star_3_received
                     print(streak)
@@ -564,7 +571,7 @@ def game_start():
                     high_score = streak
                     np.save('high_score.npy', np.array([streak]))
                     if streak >= 100:
-                        car = Car(wb2.x, wb2.y + wb2.h/2, 64, 48, pygame.image.load('Assets/car_g.png'))
+                        car = Car(wb2.x, wb2.y + wb2.h/2, 64, 48, asset_manager.image('Assets/car_g.png'))
 
                 for x in range(30):
                     pygame.display.flip()
@@ -588,16 +595,16 @@ def game_start():
             flag_received = True
 
         if star_1_received:
-            star_1.pop()
+            star_1.pop(dt)
 
         if star_2_received:
-            star_2.pop()
+            star_2.pop(dt)
 
         if star_3_received:
-            star_3.pop()
+            star_3.pop(dt)
 
         if flag_received:
-            flag.pop()
+            flag.pop(dt)
 
         # Drawing
         screen.fill('white')
@@ -632,11 +639,13 @@ def game_start():
 
         # Updating the window
         pygame.display.flip()
-        clock.tick(60)
+        dt = clock.tick(60) / 1000
 
 
 if __name__ == '__main__':
     pygame.init()
+    if os.path.exists('Assets/assets.bundle'):
+        asset_manager.add_bundle(PGBundle('Assets/assets.bundle'))
     bg_music = pygame.mixer.Sound('Assets/background_music.mp3')
     bg_music.set_volume(0.7)
     bg_music.play(-1)